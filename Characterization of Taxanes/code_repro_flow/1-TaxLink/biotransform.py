@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Biological templates and per-SMILES reaction enumeration used by scripts.py.
+
+Lives in its own module so loky workers import it (templates load once per
+worker) instead of receiving the whole reaction list with every task.
+"""
+
+
+import os
+import hashlib
+from functools import lru_cache
+from itertools import chain
+import pandas as pd
+
+from joblib import Memory
+from rdkit import Chem, DataStructs
+from rdkit.Chem import AllChem, inchi
+
+
+biological_templetes = pd.read_csv('save_folder/biological_templetes/BioTemplates.txt', sep=',')['template']
+'''
+with open('save_folder/biological_templetes/BioTemplates.txt') as txt:
+    biological_templetes = txt.readlines()
+'''
+biological_rxns = [AllChem.ReactionFromSmarts(temp) for temp in biological_templetes]
+# substructure screen: a template can only fire if its reactant pattern bits are all set in the molecule
+biological_fps = [Chem.PatternFingerprint(rxn.GetReactantTemplate(0), 2048) for rxn in biological_rxns]
+
+# on-disk cache of reaction products, one directory per template set so edited templates never hit stale results
+templates_hash = hashlib.md5('\n'.join(biological_templetes).encode()).hexdigest()[:12]
+memory = Memory(os.path.join('.cache', templates_hash), verbose=0)
+
+
+def predict_products_biological(smi):
+    mol = Chem.MolFromSmiles(smi)
+    mol_fp = Chem.PatternFingerprint(mol, 2048)
+    # RunReactants returns a tuple of product sets, each a tuple of mols
+    products = [rxn.RunReactants([mol]) for rxn, patt_fp in zip(biological_rxns, biological_fps)
+                if DataStructs.AllProbeBitsMatch(patt_fp, mol_fp)]
+    products = chain.from_iterable(chain.from_iterable(products))
+    return sorted({Chem.MolToSmiles(p) for p in products})
+
+
+# smi_list holds canonical SMILES, so identical molecules share a cache entry
+predict_products_biological = memory.cache(predict_products_biological)
+
+
+# products repeat across molecules, so each worker keeps its own SMILES -> InChIKey prefix cache
+@lru_cache(maxsize=None)
+def _shortkey(smi):
+    mol = Chem.MolFromSmiles(smi)
+    return None if mol is None else inchi.MolToInchiKey(mol)[:14]
+
+
+def predict_shortkeys_biological(smi):
+    prods = predict_products_biological(smi)
+    return [k for k in map(_shortkey, prods) if k is not None]
@@ -14,64 +14,56 @@ import numpy as np
 import pandas as pd
 
 from tqdm import tqdm
+from joblib import Parallel, delayed
 from rdkit import Chem, DataStructs
 from rdkit.Chem import AllChem, Draw, inchi
 
+from biotransform import predict_shortkeys_biological
+
 
 with open('save_folder/chemical_templetes/templates_general.json') as js:
     chemical_templetes = list(json.load(js).keys())
     chemical_rxns = [AllChem.ReactionFromSmarts(temp) for temp in chemical_templetes]
 
-biological_templetes = pd.read_csv('save_folder/biological_templetes/BioTemplates.txt', sep=',')['template']
-'''
-with open('save_folder/biological_templetes/BioTemplates.txt') as txt:
-    biological_templetes = txt.readlines()
-'''
-biological_rxns = [AllChem.ReactionFromSmarts(temp) for temp in biological_templetes]
-
-    
-def flatten_list(lst):
-    flattened = []
-    for item in lst:
-        if isinstance(item, tuple):
-            flattened.extend(flatten_list(item))
-        else:
-            flattened.append(item)
-    return flattened
-
-
-def predict_products_biological(smi):
-    mol = Chem.MolFromSmiles(smi)
-    products = [rxn.RunReactants([mol]) for rxn in biological_rxns]
-    products = [s for s in products if len(s) > 0]
-    products = flatten_list(products)
-    products_smiles = np.unique([Chem.MolToSmiles(p) for p in products])
-    return list(products_smiles)
-
-
-tax_list = pd.read_excel('data/TaxList1.xlsx')
-smi_list = tax_list['Isomeric SMILES']
-mol_list = [Chem.MolFromSmiles(s) for s in smi_list]
-mol_list = [m for m in mol_list if m is not None]
-smi_list = [Chem.MolToSmiles(m) for m in mol_list]
-short_keys = [inchi.MolToInchiKey(m)[:14] for m in mol_list if m is not None]
+tax_list = pd.read_excel('data/TaxList1.xlsx', engine='calamine')
+# one pass: keep canonical SMILES, mol and InChIKey prefix aligned, skipping invalid entries
+records = []
+for s in tax_list['Isomeric SMILES']:
+    m = Chem.MolFromSmiles(s)
+    if m is None:
+        continue
+    k = inchi.MolToInchiKey(m)
+    if not k:
+        continue
+    records.append((Chem.MolToSmiles(m), m, k[:14]))
+smi_list, mol_list, short_keys = map(list, zip(*records))
 
 link_matrix = np.zeros((len(smi_list), len(smi_list)))
 from_to_list = []
 
-# biological transformation
-for i, smi in enumerate(tqdm(smi_list)):
-    prods = predict_products_biological(smi)
-    prods_mols = [Chem.MolFromSmiles(m) for m in prods]
-    prods_shortkeys = [inchi.MolToInchiKey(m)[:14] for m in prods_mols if m is not None]
-    j = np.where([k in prods_shortkeys for k in short_keys])[0]
+# different molecules can share an InChIKey prefix, so keep every index per key
+short_key_to_idx = {}
+for idx, k in enumerate(short_keys):
+    short_key_to_idx.setdefault(k, []).append(idx)
+
+# biological transformation, one independent job per SMILES
+all_prods_shortkeys = Parallel(n_jobs=-1, backend='loky')(
+    delayed(predict_shortkeys_biological)(smi) for smi in tqdm(smi_list))
+
+for i, prods_shortkeys in enumerate(all_prods_shortkeys):
+    j = sorted({jj for k in set(prods_shortkeys) for jj in short_key_to_idx.get(k, [])})
     if len(j) > 0:
-        for jj in j:
-            link_matrix[i,jj] = 1
-            link_matrix[jj,i] = 1
-            from_to_list.append([jj, i])
+        link_matrix[i, j] = 1
+        from_to_list.extend([jj, i] for jj in j)
+link_matrix = np.maximum(link_matrix, link_matrix.T)
 
 with open('smiles_list.txt', 'w') as txt:
-    txt.writelines(smi_list)
-pd.DataFrame(link_matrix).to_csv('linkage_new.csv')
-pd.DataFrame(from_to_list).to_csv('from_to_list.csv')
+    txt.write('\n'.join(smi_list))
+# same layout as DataFrame.to_csv (header row + index column), written as integers
+n_nodes = len(smi_list)
+np.savetxt('linkage_new.csv', np.column_stack([np.arange(n_nodes), link_matrix.astype(np.uint8)]),
+           fmt='%d', delimiter=',', header=','.join([''] + [str(k) for k in range(n_nodes)]), comments='')
+from_to_arr = np.asarray(from_to_list, dtype=np.int32).reshape(-1, 2)
+# pandas writes an empty DataFrame as a lone "" header line
+np.savetxt('from_to_list.csv', np.column_stack([np.arange(len(from_to_arr)), from_to_arr]),
+           fmt='%d', delimiter=',', header=',0,1' if len(from_to_arr) else '""', comments='')
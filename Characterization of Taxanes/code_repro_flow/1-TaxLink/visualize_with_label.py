@@ -1,6 +1,8 @@
+import numpy as np
 import pandas as pd
 import gravis as gv
 import networkx as nx
+from scipy import sparse
 
 # 加载邻接矩阵
 file_path = 'data/linkage_new.csv'
@@ -13,15 +15,15 @@ adj_matrix.columns = adj_matrix.columns.astype(int)
 # 确认邻接矩阵的值分布是否符合预期
 print(adj_matrix.describe())
 
-# 创建一个 NetworkX 图
-G = nx.Graph()
-
-# 根据邻接矩阵添加边，1 表示有连接，0 表示无连接
-for i, row in adj_matrix.iterrows():
-    for j, value in row.items():
-        # 如果 i 和 j 不同，并且值为 1，则添加边
-        if int(i) != int(j) and value == 1.0:
-            G.add_edge(i, j)
+# 根据邻接矩阵一次性构建 NetworkX 图，1 表示有连接，0 表示无连接（忽略自环）
+A = (adj_matrix.values == 1.0).astype(np.uint8)
+np.fill_diagonal(A, 0)
+# 连接很稀疏，用 CSR 稀疏矩阵建图，耗时只与边数相关
+A = sparse.csr_matrix(A)
+G = nx.from_scipy_sparse_array(A)
+G = nx.relabel_nodes(G, dict(enumerate(adj_matrix.index)))
+# 只保留有连接的节点
+G.remove_nodes_from(list(nx.isolates(G)))
 
 # 加载 SMILES 数据
 smiles_path = 'data/TaxList1.csv'
@@ -33,6 +35,9 @@ df_smiles = df_smiles.reset_index(drop=True)
 # 打印 SMILES 数据的前几行以确认正确加载
 print(df_smiles.head())
 
+# 预先生成每个节点的点击信息
+click_map = ('smiles: ' + df_smiles.astype(str)).to_dict()
+
 # 设置节点的颜色、大小和其他属性
 for node in G.nodes:
     G.nodes[node]['color'] = '#007fff'  # 设置节点默认颜色
@@ -41,12 +46,8 @@ for node in G.nodes:
     G.nodes[node]['border_size'] = 2  # 设置节点边框宽度
     G.nodes[node]['label'] = node  # 节点标签为节点号
 
-    # 如果节点号超出 SMILES 数据范围，跳过处理
-    if int(node) >= len(df_smiles):
-        G.nodes[node]['click'] = 'No SMILES data'
-    else:
-        smiles = str(df_smiles[int(node)])  # 获取 SMILES 数据
-        G.nodes[node]['click'] = f'smiles: {smiles}'
+    # 如果节点号超出 SMILES 数据范围，显示无数据
+    G.nodes[node]['click'] = click_map.get(node, 'No SMILES data')
 
 # 使用 gravis 进行可视化
 fig = gv.d3(G, node_label_data_source='label')
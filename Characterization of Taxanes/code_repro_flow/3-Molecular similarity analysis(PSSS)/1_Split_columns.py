@@ -1,7 +1,7 @@
 import pandas as pd
 
 # Read the 0.xlsx file
-df = pd.read_excel('0.xlsx')
+df = pd.read_excel('0.xlsx', engine='calamine')
 
 original_columns = df.columns.tolist()
 
@@ -13,12 +13,8 @@ for i, col in enumerate(original_columns):
         new_columns.append(col + '_blank')  
 
 # Create a new DataFrame, initializing blank columns as NaN
-new_df = pd.DataFrame(index=df.index)
-for col in new_columns:
-    if '_blank' in col:
-        new_df[col] = pd.NA  
-    else:
-        new_df[col] = df[col] 
+blank_df = pd.DataFrame(pd.NA, index=df.index, columns=[col + '_blank' for col in original_columns[:-1]])
+new_df = pd.concat([df, blank_df], axis=1).reindex(columns=new_columns)
 
 # 2. Split the original columns by '.' and fill into the adjacent blank column
 for col in original_columns:
@@ -40,16 +36,13 @@ for col in new_df.columns:
 
 final_df = new_df[final_columns]
 
-# 4. Save the preliminary processed result to an Excel file
-final_df.to_excel('0_processed.xlsx', index=False)
+# 4. Turn the 'nan' strings left by astype(str) back into empty cells
+final_df = final_df.replace('nan', pd.NA)
 
-# 5. Read the file again and remove '_blank' from column names
-processed_df = pd.read_excel('0_processed.xlsx')
-# Replace '_blank' with '' in column names
-new_column_names = [col.replace('_blank', '') for col in processed_df.columns]
-processed_df.columns = new_column_names
+# 5. Remove '_blank' from column names
+final_df.columns = [col.replace('_blank', '') for col in final_df.columns]
 
 # 6. Save the final result
-processed_df.to_excel('0_processed_final.xlsx', index=False)
+final_df.to_excel('0_processed_final.xlsx', index=False)
 
 print("Processing complete, final result saved as '0_processed_final.xlsx'")
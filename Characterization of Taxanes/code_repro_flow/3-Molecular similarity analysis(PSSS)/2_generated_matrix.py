@@ -1,5 +1,7 @@
+import math
 import pandas as pd
 import numpy as np
+from numba import njit, prange
 
 
 num_side_chains = int(input("Enter the number of side chain positions in the molecules of this group:"))
@@ -9,31 +11,46 @@ columns_to_parse = [f'R{i}' for i in range(1, num_side_chains + 1)]
 
 # Load data
 data_file = '0_processed_final.xlsx'  
-df = pd.read_excel(data_file)
-
-# Parse side chains
-def parse_side_chains(cell):
-    if pd.isna(cell):
-        return set()
-    return set(cell.split('.'))
-
-parsed_data = df[columns_to_parse].applymap(parse_side_chains)
+df = pd.read_excel(data_file, engine='calamine')
+
+# Parse side chains: one list of side chains per cell, empty for blank cells
+parsed_data = {
+    col: [cell if isinstance(cell, list) else [] for cell in df[col].astype('string').str.split('.')]
+    for col in columns_to_parse
+}
+
+# Add weight * ceil(|A △ B| / 2) for every pair of rows, where |A △ B| is the
+# popcount of the XORed bitmask words; rows are spread over threads
+@njit(parallel=True, cache=True)
+def accumulate_position(global_matrix, masks, weight):
+    n, n_words = masks.shape
+    for i in prange(n):
+        for j in range(n):
+            diff_size = 0
+            for w in range(n_words):
+                x = masks[i, w] ^ masks[j, w]
+                while x:
+                    x &= x - np.uint64(1)
+                    diff_size += 1
+            global_matrix[i, j] += weight * math.ceil(diff_size / 2)
 
 # Compute global difference matrix
-n = len(parsed_data)
+n = len(df)
 global_difference_matrix = np.zeros((n, n))
 
-for pos in range(len(columns_to_parse)):
-    position_matrix = np.zeros((n, n))
-    for i in range(n):
-        for j in range(n):
-            set_i = parsed_data.iloc[i, pos]
-            set_j = parsed_data.iloc[j, pos]
-            diff_size = len(set_i.symmetric_difference(set_j))
-            difference_value = np.ceil(diff_size / 2)
-            position_matrix[i, j] = difference_value
+for pos, col in enumerate(columns_to_parse):
+    # Encode each cell as a bitmask over the side chains seen at this position
+    # (one uint64 word per 64 side chains)
+    vocab_pos = sorted(set().union(*parsed_data[col]))
+    vocab_index = {tok: idx for idx, tok in enumerate(vocab_pos)}
+    n_words = max(1, (len(vocab_pos) + 63) // 64)
+    masks = np.zeros((n, n_words), dtype=np.uint64)
+    for i, side_chains in enumerate(parsed_data[col]):
+        for tok in side_chains:
+            bit = vocab_index[tok]
+            masks[i, bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
     weight = (pos + 1)**2 * 0.001
-    global_difference_matrix += weight * position_matrix
+    accumulate_position(global_difference_matrix, masks, weight)
 
 # Save global difference matrix to Excel
 global_difference_df = pd.DataFrame(global_difference_matrix, index=df['Ligand_ID'], columns=df['Ligand_ID'])
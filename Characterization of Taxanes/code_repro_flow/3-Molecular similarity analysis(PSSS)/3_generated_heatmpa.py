@@ -7,7 +7,7 @@ from scipy.spatial.distance import squareform
 
 
 excel_file = 'global_difference_matrix_difference.xlsx'
-df = pd.read_excel(excel_file, index_col=0)
+df = pd.read_excel(excel_file, index_col=0, engine='calamine')
 
 
 distance_matrix = df.values
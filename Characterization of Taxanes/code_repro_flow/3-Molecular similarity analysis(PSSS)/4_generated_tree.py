@@ -8,7 +8,7 @@ import pickle
 
 # Read the similarity matrix from the Excel file
 excel_file = "global_difference_matrix_difference.xlsx"
-df = pd.read_excel(excel_file, index_col=0)
+df = pd.read_excel(excel_file, index_col=0, engine='calamine')
 
 # Obtain the distance matrix
 distance_matrix = df.values
@@ -39,13 +39,24 @@ with open('UPGMA_tree.pkl', 'wb') as f:
     pickle.dump(Z, f)
 
 # Convert to strict iTOL-compatible Newick format
-def build_newick(node, leaf_names, parent_dist):
-    if node.is_leaf():
-        return f"{leaf_names[node.id]}:{max(parent_dist - node.dist, 0):.6f}"
-    else:
-        left = build_newick(node.get_left(), leaf_names, node.dist)
-        right = build_newick(node.get_right(), leaf_names, node.dist)
-        return f"({left},{right}):{max(parent_dist - node.dist, 0):.6f}"
+# (iterative post-order traversal, so deep trees do not hit the recursion limit)
+def build_newick(root, leaf_names, parent_dist):
+    subtrees = {}
+    stack = [(root, parent_dist, False)]
+    while stack:
+        node, dist, children_done = stack.pop()
+        branch_length = max(dist - node.dist, 0)
+        if node.is_leaf():
+            subtrees[node.id] = f"{leaf_names[node.id]}:{branch_length:.6f}"
+        elif not children_done:
+            stack.append((node, dist, True))
+            stack.append((node.get_right(), node.dist, False))
+            stack.append((node.get_left(), node.dist, False))
+        else:
+            left = subtrees.pop(node.get_left().id)
+            right = subtrees.pop(node.get_right().id)
+            subtrees[node.id] = f"({left},{right}):{branch_length:.6f}"
+    return subtrees[root.id]
 
 def linkage_to_newick(Z, labels):
     tree = to_tree(Z, rd=False)
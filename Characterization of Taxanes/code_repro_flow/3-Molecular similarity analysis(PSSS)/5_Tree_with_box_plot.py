@@ -1,6 +1,7 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle
+from matplotlib.collections import PatchCollection
 import re
 import mpld3
 import numpy as np
@@ -21,7 +22,7 @@ print("Raw tree leaf names:", raw_leaf_names)
 print("Tree leaf names:", leaf_names)
 
 # 2. Read and normalize the Excel file
-df = pd.read_excel('0_processed_final.xlsx', header=0)
+df = pd.read_excel('0_processed_final.xlsx', header=0, engine='calamine')
 raw_excel_names = df.iloc[:, 0].tolist()
 df.iloc[:, 0] = df.iloc[:, 0].astype(str).str.strip().str.lower()
 excel_names = df.iloc[:, 0].tolist()
@@ -49,7 +50,7 @@ r_order = [f'R{i}' for i in range(1, 16)]
 r_groups_ordered = {r: r_groups[r] for r in r_order if r in r_groups}
 
 # 4. Read the color mapping
-color_df = pd.read_excel('element_color_mapping.xlsx', header=0)
+color_df = pd.read_excel('element_color_mapping.xlsx', header=0, engine='calamine')
 color_dict = dict(zip(color_df.iloc[:, 1], color_df.iloc[:, 3]))
 label_dict = dict(zip(color_df.iloc[:, 1], color_df.iloc[:, 0]))
 color_dict['**'] = 'none'
@@ -83,8 +84,8 @@ for r in r_groups_ordered.keys():
     x += n * w + (n - 1) * s_sub + s_h
 
 # 7. Calculate the number of color types per column and row
-col_color_counts = {col: len(set(df[col].dropna().unique())) for col in column_centers.keys()}
-row_color_counts = [len(set(df.iloc[i, 1:].dropna().unique())) for i in range(m)]
+col_color_counts = df[list(column_centers.keys())].nunique(axis=0, dropna=True).to_dict()
+row_color_counts = df.iloc[:, 1:].nunique(axis=1, dropna=True).to_numpy()
 
 # 8. Create the main figure
 fig, (ax1, ax2) = plt.subplots(1, 2, gridspec_kw={'width_ratios': [1, 3]}, figsize=(11.69, 8.27))
@@ -107,6 +108,8 @@ y_centers = [y_coords[name] for name in leaf_names]
 # 10. Draw the box plot on the right
 ax2.set_xlim(0, x + w)
 ax2.set_ylim(min(y_centers) - h, max(y_centers) + h)
+cell_rects = []
+cell_colors = []
 for i in range(m):
     for r in r_groups_ordered.keys():
         cols = r_groups_ordered[r]
@@ -117,9 +120,9 @@ for i in range(m):
             if pd.isna(val):
                 continue
             else:
-                color = color_dict.get(val, 'grey')
-                rect = Rectangle((center_x - w / 2, center_y - h / 2), w, h, color=color, ec='black', lw=0.5)
-                ax2.add_patch(rect)
+                cell_rects.append(Rectangle((center_x - w / 2, center_y - h / 2), w, h))
+                cell_colors.append(color_dict.get(val, 'grey'))
+ax2.add_collection(PatchCollection(cell_rects, facecolors=cell_colors, edgecolors='black', linewidths=0.5))
 
 # Add R column labels
 for r, x_pos in r_label_positions.items():
@@ -151,7 +154,7 @@ ax1.axis('off')
 ax2.axis('off')
 
 # 15. Save the main figure as PDF (without legend)
-plt.savefig('main_output_with_bars.pdf', format='pdf', bbox_inches='tight', pad_inches=0.1)
+fig.savefig('main_output_with_bars.pdf', format='pdf', bbox_inches='tight', pad_inches=0.1)
 print("Main figure with bar charts saved as 'main_output_with_bars.pdf'")
 
 # 16. Save the legend separately as PDF
@@ -171,62 +174,17 @@ ax_legend.axis('off')
 plt.savefig('legend_output.pdf', format='pdf', bbox_inches='tight')
 print("Legend saved as 'legend_output.pdf'")
 
-# 17. HTML output (increase canvas width)
-fig_html, (ax1_html, ax2_html) = plt.subplots(1, 2, gridspec_kw={'width_ratios': [1, 3]}, figsize=(18, 15))  # Increase width from 15 to 18
-Phylo.draw(tree, axes=ax1_html, do_show=False, label_func=lambda x: x.name if x.name else '')
-for text in ax1_html.texts:
+# 17. HTML output: reuse the main figure on a larger canvas, with leaf labels and legend
+for text in ax1.texts:
     if text.get_text() in raw_leaf_names:
+        text.set_visible(True)
         text.set_fontsize(6)
-ax1_html.set_title("Phylogenetic Tree")
 
-# Use the same Y coordinates
-y_centers_html = y_centers
+ax2.legend(handles=legend_patches, labels=legend_labels, loc='upper left', bbox_to_anchor=(1.1, 1), 
+           title="Legend", fontsize=8, frameon=False)
+fig.set_size_inches(18, 15)
 
-ax2_html.set_xlim(0, x + w)
-ax2_html.set_ylim(min(y_centers_html) - h, max(y_centers_html) + h)
-for i in range(m):
-    for r in r_groups_ordered.keys():
-        cols = r_groups_ordered[r]
-        for col in cols:
-            val = df[col].iloc[i]
-            center_x = column_centers[col]
-            center_y = y_centers_html[i]
-            if pd.isna(val):
-                continue
-            else:
-                color = color_dict.get(val, 'grey')
-                rect = Rectangle((center_x - w / 2, center_y - h / 2), w, h, color=color, ec='black', lw=0.5)
-                ax2_html.add_patch(rect)
-
-# Add R column labels
-for r, x_pos in r_label_positions.items():
-    ax2_html.text(x_pos, min(y_centers_html) - h / 2, r, ha='center', va='center', fontsize=8, fontweight='bold')
-
-# HTML bar charts
-ax2_html_pos = ax2_html.get_position()
-ax3_html = fig_html.add_axes([ax2_html_pos.x0, 0.9, ax2_html_pos.width, 0.08])
-ax3_html.bar(list(column_centers.values()), [col_color_counts[col] for col in column_centers.keys()], 
-             width=w, align='center', color='lightblue')
-ax3_html.set_xlim(0, x + w)
-ax3_html.set_ylim(0, max(col_color_counts.values()) + 1)
-ax3_html.set_title("Column Color Types", fontsize=8)
-ax3_html.xaxis.set_visible(False)
-
-ax4_html = fig_html.add_axes([0.9, ax2_html_pos.y0, 0.08, ax2_html_pos.height])
-ax4_html.barh(y_centers_html, row_color_counts, height=h, align='center', color='lightgreen')
-ax4_html.set_ylim(min(y_centers_html) - h, max(y_centers_html) + h)
-ax4_html.set_xlim(0, max(row_color_counts) + 1)
-ax4_html.set_title("Row Color Types", fontsize=8, rotation=90, ha='center')
-ax4_html.yaxis.set_visible(False)
-
-# Add legend to HTML
-ax2_html.legend(handles=legend_patches, labels=legend_labels, loc='upper left', bbox_to_anchor=(1.1, 1), 
-                title="Legend", fontsize=8, frameon=False)
-
-ax1_html.axis('off')
-ax2_html.axis('off')
-
-html_str = mpld3.fig_to_html(fig_html)
+html_str = mpld3.fig_to_html(fig)
 with open('output_with_bars.html', 'w', encoding='utf-8') as f:
     f.write(html_str)
 print("HTML figure with bar charts and legend saved as 'output_with_bars.html'")
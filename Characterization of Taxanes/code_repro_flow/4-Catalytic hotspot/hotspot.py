@@ -1,25 +1,37 @@
+import math
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.colors import Normalize, to_hex, LinearSegmentedColormap
 from matplotlib.cm import ScalarMappable
+from numba import njit
+
+# Hill numbers for all q values in one compiled loop
+@njit(cache=True, fastmath=True)
+def _hill(p, q_values):
+    out = np.empty(len(q_values))
+    for k in range(len(q_values)):
+        q = q_values[k]
+        s = 0.0
+        if abs(q - 1.0) < 1e-12:
+            for x in p:
+                if x > 0:
+                    s -= x * math.log(x)
+            out[k] = math.exp(s)
+        else:
+            for x in p:
+                if x > 0:
+                    s += x ** q
+            out[k] = s ** (1.0 / (1.0 - q))
+    return out
 
 # Hill number calculation function
 def calculate_hill_numbers(counts, q_values):
     total = sum(counts)
     if total == 0:
         return [0] * len(q_values)
-    p_i = np.array(counts) / total
-    hill_numbers = []
-    for q in q_values:
-        if q == 1:
-            shannon = -sum(p * np.log(p) for p in p_i if p > 0)
-            hill = np.exp(shannon)
-        else:
-            p_i_nonzero = p_i[p_i > 0]
-            hill = np.power(np.sum(np.power(p_i_nonzero, q)), 1/(1-q)) if p_i_nonzero.size > 0 else 0
-        hill_numbers.append(hill)
-    return hill_numbers
+    p_i = np.ascontiguousarray(np.asarray(counts, dtype=np.float64) / total)
+    return list(_hill(p_i, np.asarray(q_values, dtype=np.float64)))
 
 # User input for the number of side chains
 try:
@@ -36,7 +48,7 @@ columns_to_parse = [f'R{i}' for i in range(1, num_side_chains + 1)]
 # Load data
 data_file = '0.xlsx'
 try:
-    df = pd.read_excel(data_file)
+    df = pd.read_excel(data_file, engine='calamine')
 except FileNotFoundError:
     print(f"Error: file {data_file} not found")
     exit()
@@ -13,10 +13,15 @@ The script also exports per-family per-chromosome gene counts to Excel.
 """
 
 import re
+from functools import lru_cache
 import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # file output only; skip GUI backend selection
 import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle, Ellipse, Arc
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.path import Path
+from matplotlib.transforms import Affine2D
 
 # ===================== Configuration =====================
 # Input files for hap1
@@ -33,6 +38,8 @@ TOP_FILE = "all-90.csv"   # expected columns: protein_ID, family, ...
 # Output files
 OUTPUT_FIG = "genome_gene_positions.pdf"
 OUTPUT_XLSX = "family_chrom_counts.xlsx"
+# Write the three count tables as CSV (<OUTPUT_XLSX stem>_<sheet>.csv) instead of xlsx
+FAST_EXPORT = False
 
 # Figure layout parameters
 BASE_FIG_W_PER_BLOCK = 12.0
@@ -94,27 +101,49 @@ SCALE_TICKS_MIN = 6
 SCALE_TICKS_MAX = 12
 
 DPI = 300
+# Rasterize capsules and gene ticks at DPI (labels stay vector); worth it for dense gene sets
+RASTERIZE_SHAPES = False
 # =========================================================
 
+_CHR_RE = re.compile(r"TcChr(\d+)[ab]?$")
 
-def read_locations(path):
-    """Read gene location file: GeneID, Chr, Start, End, Strand."""
-    return pd.read_csv(
-        path, sep="\t", header=None, engine="python",
+# Unit semicircles for capsule caps; the outline runs over the top cap,
+# down the left side, under the bottom cap and closes up the right side
+_CAP_TOP = Path.arc(0, 180)
+_CAP_BOTTOM = Path.arc(180, 360)
+_CAPSULE_CODES = np.concatenate([_CAP_TOP.codes, [Path.LINETO], _CAP_BOTTOM.codes[1:], [Path.CLOSEPOLY]])
+
+# Candidate Mb steps for the scale bar
+_MB_STEP_CANDIDATES = np.array([
+    5, 10, 12, 20, 25, 30, 40, 50, 60, 75, 80, 90, 100,
+    108, 120, 150, 180, 200, 250, 300, 360, 400, 450, 500,
+    600, 750, 800, 900, 1000
+], dtype=float)
+
+
+def read_locations(path, wanted=None, chunksize=500_000):
+    """
+    Read gene location file: GeneID, Chr, Start, End, Strand.
+    The file is streamed in chunks; if `wanted` is given, only rows whose
+    GeneID is in it are kept.
+    """
+    reader = pd.read_csv(
+        path, sep="\t", header=None,
         names=["GeneID", "Chr", "Start", "End", "Strand"],
-        dtype={"GeneID": str, "Chr": str, "Start": int, "End": int, "Strand": str}
+        dtype={"GeneID": str, "Chr": str, "Start": int, "End": int, "Strand": str},
+        chunksize=chunksize
     )
+    parts = [chunk if wanted is None else chunk[chunk["GeneID"].isin(wanted)] for chunk in reader]
+    return pd.concat(parts, ignore_index=True)
 
 
 def read_fai(path):
     """Read FASTA index (.fai) file and extract chromosome lengths."""
-    fai = pd.read_csv(
+    return pd.read_csv(
         path, sep="\t", header=None, usecols=[0, 1],
-        names=["Chr", "Length"], engine="python"
+        names=["Chr", "Length"],
+        dtype={"Chr": str, "Length": "int64"}
     )
-    fai["Length"] = pd.to_numeric(fai["Length"], errors="coerce").astype("Int64")
-    fai = fai.dropna(subset=["Length"]).astype({"Length": int})
-    return fai
 
 
 def read_top_with_hap(path):
@@ -126,48 +155,65 @@ def read_top_with_hap(path):
     """
     t = pd.read_csv(path)
     t = t[["protein_ID", "family"]].copy()
-    t["hap"] = t["protein_ID"].astype(str).apply(
-        lambda x: "hap1" if x.startswith(HAP1_PREFIX) else "hap2"
-    )
+    pid = t["protein_ID"].astype("string")
+    t["hap"] = np.where(pid.str.startswith(HAP1_PREFIX, na=False), "hap1", "hap2")
     t = t.rename(columns={"protein_ID": "GeneID", "family": "Family"}).reset_index(drop=True)
     return t
 
 
-def pick_color_for_family(fam, idx=[0]):
-    """Return a stable color for each family, using presets if available."""
-    if fam in FAMILY_COLOR_PRESET:
-        return FAMILY_COLOR_PRESET[fam]
-    c = FALLBACK_COLORS[idx[0] % len(FALLBACK_COLORS)]
-    idx[0] += 1
-    return c
-
-
-def draw_capsule(ax, cx, by, h, w, face, edge, cap_aspect=1.0):
+def capsule_path(cx, by, h, w, cap_aspect=1.0):
     """
-    Draw a chromosome as a capsule (rounded top and bottom).
+    Build the closed outline of a chromosome capsule (rounded top and bottom).
     cx = center x, by = bottom y, h = total height, w = width.
+    Both caps are the shared unit semicircles scaled and moved into place.
     """
     cap_h = w * cap_aspect
-    body_y = by + cap_h / 2.0
-    body_h = max(0.0, h - cap_h)
+    bcy = by + cap_h / 2.0
+    tcy = bcy + max(0.0, h - cap_h)
+    scale = Affine2D().scale(w / 2.0, cap_h / 2.0)
+    top = (scale + Affine2D().translate(cx, tcy)).transform(_CAP_TOP.vertices)
+    bottom = (scale + Affine2D().translate(cx, bcy)).transform(_CAP_BOTTOM.vertices)
+    return Path(np.concatenate([top, bottom, top[:1]]), _CAPSULE_CODES)
 
-    ax.add_patch(Rectangle((cx - w/2, body_y), w, body_h, lw=0, fc=face, zorder=1))
-    bcy = by + cap_h/2.0
-    ax.add_patch(Ellipse((cx, bcy), w, cap_h, lw=0, fc=face, zorder=1))
-    ax.add_patch(Arc((cx, bcy), w, cap_h, theta1=180, theta2=360, lw=1.0, ec=edge, zorder=2))
 
-    tcy = by + h - cap_h/2.0
-    ax.add_patch(Ellipse((cx, tcy), w, cap_h, lw=0, fc=face, zorder=1))
-    ax.add_patch(Arc((cx, tcy), w, cap_h, theta1=0, theta2=180, lw=1.0, ec=edge, zorder=2))
-
-    lx, rx = cx - w/2, cx + w/2
-    ax.plot([lx, lx], [body_y, body_y + body_h], color=edge, lw=1.0, zorder=2)
-    ax.plot([rx, rx], [body_y, body_y + body_h], color=edge, lw=1.0, zorder=2)
+def hap_arrays(hap, chr_map, xs, len_map, n):
+    """
+    Dense per-hap lookup tables indexed by chromosome index:
+    chromosome name, x position (NaN if not drawn) and length.
+    """
+    names = np.full(n, None, dtype=object)
+    x_arr = np.full(n, np.nan)
+    len_arr = np.zeros(n)
+    for idx, c in chr_map.items():
+        names[idx] = c
+        x_arr[idx] = xs[(hap, c)]
+        len_arr[idx] = len_map.get(c, 0)
+    return names, x_arr, len_arr
 
 
+def tick_segments(f_h, lookup, scale, row_bottom, half):
+    """
+    Build horizontal gene tick segments for one family on one haplotype.
+    `lookup` is the (names, x, length) tuple from hap_arrays.
+    Returns an (N, 2, 2) array of segment endpoints and the N tick y values;
+    genes on chromosomes without an x position are skipped.
+    """
+    names, x_arr, len_arr = lookup
+    idxs = f_h["ChrIndex"].to_numpy()
+    keep = names[idxs] == f_h["Chr"].to_numpy()
+    idxs = idxs[keep]
+    mids = f_h["Mid"].to_numpy(dtype=float)[keep]
+    x = x_arr[idxs]
+    L = len_arr[idxs]
+    y = row_bottom + L * scale - mids * scale
+    segs = np.stack([np.stack([x - half, y], axis=1), np.stack([x + half, y], axis=1)], axis=1)
+    return segs, y
+
+
+@lru_cache(maxsize=4096)
 def chr_index(chr_name):
     """Extract chromosome numeric index from names like 'TcChr01a'."""
-    m = re.search(r"TcChr(\d+)[ab]?$", str(chr_name))
+    m = _CHR_RE.search(str(chr_name))
     if not m:
         return None
     return int(m.group(1))
@@ -226,30 +272,16 @@ def pick_mb_step(max_bp, ticks_min=6, ticks_max=12):
 
     max_mb = max_bp / 1e6
 
-    candidates = np.array([
-        5, 10, 12, 20, 25, 30, 40, 50, 60, 75, 80, 90, 100,
-        108, 120, 150, 180, 200, 250, 300, 360, 400, 450, 500,
-        600, 750, 800, 900, 1000
-    ], dtype=float)
-
+    candidates = _MB_STEP_CANDIDATES
     if max_mb > candidates[-1]:
         scale = 10 ** np.floor(np.log10(max_mb))
-        for base in [1, 2, 2.5, 5]:
-            candidates = np.append(candidates, base * scale)
-
-    best, best_diff = candidates[0], 1e9
-    for step in candidates:
-        n = max_mb / step
-        if n < ticks_min:
-            diff = ticks_min - n
-        elif n > ticks_max:
-            diff = n - ticks_max
-        else:
-            diff = abs(n - round(n))
-        if diff < best_diff:
-            best, best_diff = step, diff
+        candidates = np.append(candidates, np.array([1, 2, 2.5, 5]) * scale)
 
-    return best * 1e6
+    n = max_mb / candidates
+    diff = np.where(n < ticks_min, ticks_min - n,
+                    np.where(n > ticks_max, n - ticks_max,
+                             np.abs(n - np.round(n))))
+    return float(candidates[int(diff.argmin())]) * 1e6
 
 
 def draw_scale_bar(ax, x_scale, row_bottom, row_height, max_bp_ref,
@@ -295,35 +327,45 @@ def draw_scale_bar(ax, x_scale, row_bottom, row_height, max_bp_ref,
 
 def main():
     # ---------------- Load input data ----------------
-    df_loc_h1 = read_locations(LOC_FILE_H1)
-    df_loc_h2 = read_locations(LOC_FILE_H2)
+    df_top = read_top_with_hap(TOP_FILE)
     df_fai_h1 = read_fai(FAI_FILE_H1)
     df_fai_h2 = read_fai(FAI_FILE_H2)
-    df_top = read_top_with_hap(TOP_FILE)
 
     # Assign haplotypes based on naming rule
     top_h1 = df_top[df_top["hap"] == "hap1"][["GeneID", "Family"]].copy()
     top_h2 = df_top[df_top["hap"] == "hap2"][["GeneID", "Family"]].copy()
 
+    # Only the annotated genes are needed from the location files
+    df_loc_h1 = read_locations(LOC_FILE_H1, wanted=set(top_h1["GeneID"]))
+    df_loc_h2 = read_locations(LOC_FILE_H2, wanted=set(top_h2["GeneID"]))
+
     # Merge with gene location files
     m_h1 = top_h1.merge(df_loc_h1, on="GeneID", how="left")
     m_h2 = top_h2.merge(df_loc_h2, on="GeneID", how="left")
 
     # Clean and compute midpoints
     def cleanup(m):
-        m = m.dropna(subset=["Chr", "Start", "End"]).copy()
-        m["Start"] = pd.to_numeric(m["Start"], errors="coerce")
-        m["End"] = pd.to_numeric(m["End"], errors="coerce")
-        m = m.dropna(subset=["Start", "End"]).copy()
-        m["Mid"] = (m["Start"] + m["End"]) / 2.0
+        start = pd.to_numeric(m["Start"], errors="coerce").to_numpy()
+        end = pd.to_numeric(m["End"], errors="coerce").to_numpy()
+        mask = ~(pd.isna(m["Chr"].to_numpy()) | np.isnan(start) | np.isnan(end))
+        m = m.loc[mask].copy()
+        m["Start"] = start[mask]
+        m["End"] = end[mask]
+        m["Mid"] = (start[mask] + end[mask]) * 0.5
         return m
 
     m_h1 = cleanup(m_h1)
     m_h2 = cleanup(m_h2)
 
     # Keep only chromosomes present in FAI files
-    m_h1 = m_h1[m_h1["Chr"].isin(df_fai_h1["Chr"].unique())].copy()
-    m_h2 = m_h2[m_h2["Chr"].isin(df_fai_h2["Chr"].unique())].copy()
+    valid_h1 = set(df_fai_h1["Chr"])
+    valid_h2 = set(df_fai_h2["Chr"])
+    m_h1 = m_h1[m_h1["Chr"].isin(valid_h1)].copy()
+    m_h2 = m_h2[m_h2["Chr"].isin(valid_h2)].copy()
+
+    # Numeric chromosome index per gene (0 if the name has none)
+    for m in (m_h1, m_h2):
+        m["ChrIndex"] = m["Chr"].map({c: chr_index(c) or 0 for c in m["Chr"].unique()}).astype(np.intp)
 
     # Determine family list
     families = sorted(
@@ -359,24 +401,55 @@ def main():
     len_h2_map = dict(zip(df_fai_h2["Chr"], df_fai_h2["Length"]))
     max_bp_ref = max(max_len_h1, max_len_h2)
 
-    min_y, max_y = 1e9, -1e9
+    # Chromosome lookups as arrays indexed by chromosome index, for tick placement
+    n_idx = max(indices) + 1
+    lookup_h1 = hap_arrays("hap1", map_h1, xs, len_h1_map, n_idx)
+    lookup_h2 = hap_arrays("hap2", map_h2, xs, len_h2_map, n_idx)
+
+    # Vertical extents collected per row/tick set and reduced once at the end
+    y_lo, y_hi = [], []
+
+    # Assign colors to families: presets first, fallback palette cycles over the rest
+    unpreset = [f for f in families if f not in FAMILY_COLOR_PRESET]
+    fam2color = {f: FALLBACK_COLORS[i % len(FALLBACK_COLORS)] for i, f in enumerate(unpreset)}
+    fam2color.update({f: FAMILY_COLOR_PRESET[f] for f in families if f in FAMILY_COLOR_PRESET})
+
+    # Accumulate count table column by column
+    cr_fam, cr_hap, cr_chr, cr_idx, cr_n = [], [], [], [], []
 
-    # Assign colors to families
-    used_idx = [0]
-    fam2color = {f: pick_color_for_family(f, used_idx) for f in families}
+    def add_count(fam, hap, c, idx, n):
+        cr_fam.append(fam)
+        cr_hap.append(hap)
+        cr_chr.append(c)
+        cr_idx.append(idx)
+        cr_n.append(n)
 
-    # Accumulate count table
-    count_rows = []
+    # Chromosome capsule outlines, added as one collection after the loop
+    capsule_paths = []
+
+    # Count and chromosome labels grouped by (color, fontsize), drawn after the loop
+    texts_by_style = {}
+
+    # Split genes by family once instead of masking the full table per family
+    groups_h1 = dict(tuple(m_h1.groupby("Family", sort=False)))
+    groups_h2 = dict(tuple(m_h2.groupby("Family", sort=False)))
+
+    # Gene counts for each family × chromosome, keyed by (family, chr)
+    cnt_h1 = m_h1.groupby(["Family", "Chr"]).size().to_dict()
+    cnt_h2 = m_h2.groupby(["Family", "Chr"]).size().to_dict()
 
     # Starting baseline
     top_y = TOP_MARGIN + BASE_FIG_H_PER_ROW * len(families)
 
+    # Half-length of gene tick marks
+    half = CHROM_WIDTH * TICK_LINE_LEN_FACTOR / 2.0
+
     # ---------------- Per-family plotting ----------------
     for r, fam in enumerate(families):
         row_bottom = top_y - (r + 1) * BASE_FIG_H_PER_ROW + 0.15
 
-        f_h1 = m_h1[m_h1["Family"] == fam].copy()
-        f_h2 = m_h2[m_h2["Family"] == fam].copy()
+        f_h1 = groups_h1.get(fam, m_h1.iloc[0:0])
+        f_h2 = groups_h2.get(fam, m_h2.iloc[0:0])
 
         # Left-side Mb scale bar
         if SHOW_SCALE_BAR and max_bp_ref > 0:
@@ -392,9 +465,7 @@ def main():
             color=LABEL_COLOR, weight="bold"
         )
 
-        # Gene counts for each hap × chromosome
-        cnt_h1 = f_h1.groupby("Chr").size().to_dict()
-        cnt_h2 = f_h2.groupby("Chr").size().to_dict()
+        count_color = fam2color[fam] if COUNT_COLOR_MODE == "family" else (COUNT_COLOR_MODE or "black")
 
         # ---- Draw chromosomes (hap1 and hap2) ----
         for idx in indices:
@@ -405,94 +476,77 @@ def main():
                 L1 = int(len_h1_map.get(c1, 0))
                 h1 = L1 * scale_h1
                 x1 = xs[("hap1", c1)]
-                draw_capsule(ax, x1, row_bottom, h1, CHROM_WIDTH, CHROM_FACE, EDGE_COLOR, CAP_ASPECT)
+                capsule_paths.append(capsule_path(x1, row_bottom, h1, CHROM_WIDTH, CAP_ASPECT))
 
-                n1 = int(cnt_h1.get(c1, 0))
-                count_rows.append({"Family": fam, "Hap": "hap1", "Chr": c1, "ChrIndex": idx, "Count": n1})
+                n1 = int(cnt_h1.get((fam, c1), 0))
+                add_count(fam, "hap1", c1, idx, n1)
 
                 if SHOW_ZERO_COUNTS or n1 > 0:
-                    count_color = fam2color[fam] if COUNT_COLOR_MODE == "family" else (COUNT_COLOR_MODE or "black")
                     y_count = row_bottom + h1 + COUNT_PAD_ABOVE
-                    ax.text(x1, y_count, str(n1),
-                            ha="center", va="bottom",
-                            fontsize=COUNT_FONT_SIZE, color=count_color)
-                    max_y = max(max_y, y_count)
+                    texts_by_style.setdefault((count_color, COUNT_FONT_SIZE), []).append((x1, y_count, str(n1)))
+                    y_hi.append(y_count)
 
                 if r == 0:
                     y_label = row_bottom + h1 + COUNT_PAD_ABOVE + CHR_LABEL_EXTRA_PAD
-                    ax.text(x1, y_label, c1,
-                            ha="center", va="bottom",
-                            fontsize=CHR_LABEL_FONTSIZE, color=LABEL_COLOR)
-                    max_y = max(max_y, y_label)
+                    texts_by_style.setdefault((LABEL_COLOR, CHR_LABEL_FONTSIZE), []).append((x1, y_label, c1))
+                    y_hi.append(y_label)
 
-                min_y = min(min_y, row_bottom)
-                max_y = max(max_y, row_bottom + h1)
+                y_hi.append(row_bottom + h1)
 
             if c2:
                 L2 = int(len_h2_map.get(c2, 0))
                 h2 = L2 * scale_h2
                 x2 = xs[("hap2", c2)]
-                draw_capsule(ax, x2, row_bottom, h2, CHROM_WIDTH, CHROM_FACE, EDGE_COLOR, CAP_ASPECT)
+                capsule_paths.append(capsule_path(x2, row_bottom, h2, CHROM_WIDTH, CAP_ASPECT))
 
-                n2 = int(cnt_h2.get(c2, 0))
-                count_rows.append({"Family": fam, "Hap": "hap2", "Chr": c2, "ChrIndex": idx, "Count": n2})
+                n2 = int(cnt_h2.get((fam, c2), 0))
+                add_count(fam, "hap2", c2, idx, n2)
 
                 if SHOW_ZERO_COUNTS or n2 > 0:
-                    count_color = fam2color[fam] if COUNT_COLOR_MODE == "family" else (COUNT_COLOR_MODE or "black")
                     y_count = row_bottom + h2 + COUNT_PAD_ABOVE
-                    ax.text(x2, y_count, str(n2),
-                            ha="center", va="bottom",
-                            fontsize=COUNT_FONT_SIZE, color=count_color)
-                    max_y = max(max_y, y_count)
+                    texts_by_style.setdefault((count_color, COUNT_FONT_SIZE), []).append((x2, y_count, str(n2)))
+                    y_hi.append(y_count)
 
                 if r == 0:
                     y_label = row_bottom + h2 + COUNT_PAD_ABOVE + CHR_LABEL_EXTRA_PAD
-                    ax.text(x2, y_label, c2,
-                            ha="center", va="bottom",
-                            fontsize=CHR_LABEL_FONTSIZE, color=LABEL_COLOR)
-                    max_y = max(max_y, y_label)
+                    texts_by_style.setdefault((LABEL_COLOR, CHR_LABEL_FONTSIZE), []).append((x2, y_label, c2))
+                    y_hi.append(y_label)
 
-                min_y = min(min_y, row_bottom)
-                max_y = max(max_y, row_bottom + h2)
+                y_hi.append(row_bottom + h2)
 
-        # ---- Draw gene tick marks (hap1) ----
-        half = CHROM_WIDTH * TICK_LINE_LEN_FACTOR / 2.0
+        y_lo.append(row_bottom)
+
+        # ---- Draw gene tick marks (hap1 and hap2) ----
         col = fam2color[fam]
 
-        for _, row in f_h1.iterrows():
-            c = row["Chr"]
-            key = ("hap1", c)
-            if key not in xs:
-                continue
-            x = xs[key]
-            L = len_h1_map.get(c, 0)
-            h = L * scale_h1
-            y = row_bottom + h - float(row["Mid"]) * scale_h1
-            ax.plot([x - half, x + half], [y, y],
-                    color=col, lw=TICK_LINE_WIDTH, solid_capstyle=TICK_CAPSTYLE, zorder=3)
-            min_y = min(min_y, y - 0.1)
-            max_y = max(max_y, y + 0.1)
-
-        # ---- Draw gene tick marks (hap2) ----
-        for _, row in f_h2.iterrows():
-            c = row["Chr"]
-            key = ("hap2", c)
-            if key not in xs:
+        for f_h, lookup, scale in ((f_h1, lookup_h1, scale_h1),
+                                   (f_h2, lookup_h2, scale_h2)):
+            segs, y = tick_segments(f_h, lookup, scale, row_bottom, half)
+            if len(y) == 0:
                 continue
-            x = xs[key]
-            L = len_h2_map.get(c, 0)
-            h = L * scale_h2
-            y = row_bottom + h - float(row["Mid"]) * scale_h2
-            ax.plot([x - half, x + half], [y, y],
-                    color=col, lw=TICK_LINE_WIDTH, solid_capstyle=TICK_CAPSTYLE, zorder=3)
-            min_y = min(min_y, y - 0.1)
-            max_y = max(max_y, y + 0.1)
+            ax.add_collection(LineCollection(
+                segs, colors=col, linewidths=TICK_LINE_WIDTH, capstyle=TICK_CAPSTYLE, zorder=3,
+                rasterized=RASTERIZE_SHAPES
+            ))
+            y_lo.append(y.min() - 0.1)
+            y_hi.append(y.max() + 0.1)
+
+    # ---------------- Chromosome capsules ----------------
+    ax.add_collection(PathCollection(capsule_paths, facecolors=CHROM_FACE, edgecolors=EDGE_COLOR,
+                                     linewidths=1.0, zorder=2, rasterized=RASTERIZE_SHAPES))
+
+    # ---------------- Count and chromosome labels ----------------
+    ax.set_autoscale_on(False)
+    for (color, fontsize), items in texts_by_style.items():
+        for x, y, label in items:
+            ax.text(x, y, label, ha="center", va="bottom", fontsize=fontsize, color=color)
 
     # ---------------- Finalize plot ----------------
     x_min = (LEFT_MARGIN_X - max(SCALE_LEFT_OFFSET, 0.75) - 0.35) if SHOW_SCALE_BAR else (LEFT_MARGIN_X - 0.75)
     x_max = max(xs.values()) + RIGHT_MARGIN_X if xs else LEFT_MARGIN_X + 5
     ax.set_xlim(x_min, x_max)
 
+    min_y, max_y = min(y_lo, default=0.0), max(y_hi, default=0.0)
     pad = 0.35
     ax.set_ylim(max(0, min_y - pad), max_y + pad)
 
@@ -501,42 +555,54 @@ def main():
     for s in ax.spines.values():
         s.set_visible(False)
 
-    plt.tight_layout()
-    plt.savefig(
+    # Fixed margins (inches) instead of a tight_layout pass; the left margin leaves
+    # room for family labels and bbox_inches="tight" trims whatever is left over
+    fig.subplots_adjust(left=0.59 / fig_w, right=1 - 0.15 / fig_w,
+                        bottom=0.15 / fig_h, top=1 - 0.15 / fig_h)
+    fig.savefig(
         OUTPUT_FIG,
         dpi=DPI,
         bbox_inches="tight",
         pad_inches=0.15,
         facecolor=fig.get_facecolor()
     )
-    plt.close()
+    plt.close(fig)
     print("Figure saved:", OUTPUT_FIG)
 
     # ---------------- Export gene counts to Excel ----------------
-    if count_rows:
-        df_counts = pd.DataFrame(count_rows)
+    if cr_n:
+        df_counts = pd.DataFrame({"Family": cr_fam, "Hap": cr_hap, "Chr": cr_chr,
+                                  "ChrIndex": cr_idx, "Count": cr_n})
+        chr_order = {c: chr_index(c) or 999 for c in df_counts["Chr"].unique()}
 
         hap1_wide = (
             df_counts[df_counts["Hap"] == "hap1"]
-            .pivot_table(index="Family", columns="Chr", values="Count", aggfunc="sum")
-            .fillna(0).astype(int)
-            .sort_index(axis=1, key=lambda c: [chr_index(x) or 999 for x in c])
+            .groupby(["Family", "Chr"])["Count"].sum()
+            .unstack(fill_value=0).astype(int)
         )
+        hap1_wide = hap1_wide[sorted(hap1_wide.columns, key=chr_order.get)]
 
         hap2_wide = (
             df_counts[df_counts["Hap"] == "hap2"]
-            .pivot_table(index="Family", columns="Chr", values="Count", aggfunc="sum")
-            .fillna(0).astype(int)
-            .sort_index(axis=1, key=lambda c: [chr_index(x) or 999 for x in c])
+            .groupby(["Family", "Chr"])["Count"].sum()
+            .unstack(fill_value=0).astype(int)
         )
+        hap2_wide = hap2_wide[sorted(hap2_wide.columns, key=chr_order.get)]
 
-        with pd.ExcelWriter(OUTPUT_XLSX, engine="xlsxwriter") as writer:
-            df_counts.sort_values(["Family", "Hap", "ChrIndex", "Chr"]) \
-                .to_excel(writer, index=False, sheet_name="tidy_counts")
-            hap1_wide.to_excel(writer, sheet_name="hap1_wide")
-            hap2_wide.to_excel(writer, sheet_name="hap2_wide")
+        tidy = df_counts.sort_values(["Family", "Hap", "ChrIndex", "Chr"])
 
-        print("Gene counts exported:", OUTPUT_XLSX)
+        if FAST_EXPORT:
+            stem = OUTPUT_XLSX.rsplit(".", 1)[0]
+            tidy.to_csv(f"{stem}_tidy_counts.csv", index=False)
+            hap1_wide.to_csv(f"{stem}_hap1_wide.csv")
+            hap2_wide.to_csv(f"{stem}_hap2_wide.csv")
+            print("Gene counts exported:", f"{stem}_*.csv")
+        else:
+            with pd.ExcelWriter(OUTPUT_XLSX, engine="xlsxwriter") as writer:
+                tidy.to_excel(writer, index=False, sheet_name="tidy_counts")
+                hap1_wide.to_excel(writer, sheet_name="hap1_wide")
+                hap2_wide.to_excel(writer, sheet_name="hap2_wide")
+            print("Gene counts exported:", OUTPUT_XLSX)
     else:
         print("No gene counts available for export.")
 
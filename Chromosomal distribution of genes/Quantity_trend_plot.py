@@ -27,6 +27,9 @@ SHEET = "tidy_counts"   # Used only when IS_EXCEL=True
 OUTDIR = Path("plots_counts_pct_auto")
 OUTDIR.mkdir(exist_ok=True)
 
+# Output formats for the stacked bar plots; PNG is rasterized at 300 dpi
+STACKED_FORMATS = ("png", "pdf")
+
 # ================= Read Input Table =================
 if IS_EXCEL:
     df = pd.read_excel(INPUT, sheet_name=SHEET)
@@ -169,7 +172,7 @@ print("All percentage heatmaps have been saved to:", OUTDIR)
 # ===========================================================
 # 3) (Optional) Stacked 100% bars: family composition per chromosome
 # ===========================================================
-def plot_stacked_by_chr_pct_auto(hap: str):
+def plot_stacked_by_chr_pct_auto(hap: str, formats=STACKED_FORMATS):
     sub = df[df["Hap"] == hap].copy()
     if sub.empty:
         print("[Skip]", hap, "has no data")
@@ -187,34 +190,38 @@ def plot_stacked_by_chr_pct_auto(hap: str):
         .sort_index()
     )
 
-    # Column-normalization (within each chromosome)
-    colsum = wide.sum(axis=1).replace(0, np.nan)
-    wide_pct = (wide.T / colsum).T.fillna(0.0) * 100.0
+    # Column-normalization (within each chromosome); all-zero chromosomes stay 0
+    A = wide.to_numpy(dtype=float)
+    colsum = A.sum(axis=1, keepdims=True)
+    colsum[colsum == 0] = 1.0
+    M = A / colsum * 100.0
+
+    families = list(wide.columns)
+    x = np.arange(len(wide.index))
 
-    families = list(wide_pct.columns)
-    x = np.arange(len(wide_pct.index))
-    bottoms = np.zeros(len(x))
+    # Bar bottoms for every family from one cumulative sum (rows = chromosomes)
+    tops = np.cumsum(M, axis=1)
+    bottoms = np.hstack([np.zeros((len(x), 1)), tops[:, :-1]])
 
     fig, ax = plt.subplots(figsize=(max(8, len(x) * 0.5), 4))
 
     # Stacked bars
-    for fam in families:
+    for j, fam in enumerate(families):
         ax.bar(
             x,
-            wide_pct[fam].values,
-            bottom=bottoms,
+            M[:, j],
+            bottom=bottoms[:, j],
             label=fam
         )
-        bottoms += wide_pct[fam].values
 
     ax.set_title(f"Family composition per chromosome (%, {hap})", fontsize=12)
     ax.set_xlabel("Chromosome index")
     ax.set_ylabel("Percent (%)")
     ax.set_xticks(x)
-    ax.set_xticklabels(wide_pct.index.tolist())
+    ax.set_xticklabels(wide.index.tolist())
 
     # Auto Y limit (expected ≈100%)
-    ymax = bottoms.max() if bottoms.size else 100.0
+    ymax = tops[:, -1].max() if tops.size else 100.0
     ax.set_ylim(0, ymax * 1.05)
 
     ax.legend(
@@ -226,8 +233,8 @@ def plot_stacked_by_chr_pct_auto(hap: str):
     ax.grid(axis="y", alpha=0.3, linestyle="--", linewidth=0.8)
 
     fig.tight_layout()
-    fig.savefig(OUTDIR / f"stacked_pct_{hap}.png", dpi=300)
-    fig.savefig(OUTDIR / f"stacked_pct_{hap}.pdf")
+    for fmt in formats:
+        fig.savefig(OUTDIR / f"stacked_pct_{hap}.{fmt}", dpi=300 if fmt == "png" else "figure")
     plt.close(fig)
 
 
@@ -27,23 +27,17 @@ CHROM_ORDER_PAIRS = [
 CHROM_ORDER = [x for pair in CHROM_ORDER_PAIRS for x in pair]
 
 # ================= Read and merge data =================
-hap1 = pd.read_excel(XLSX, sheet_name=SHEET_H1).set_index('Family')
-hap2 = pd.read_excel(XLSX, sheet_name=SHEET_H2).set_index('Family')
+hap1 = pd.read_excel(XLSX, sheet_name=SHEET_H1, engine="calamine").set_index('Family')
+hap2 = pd.read_excel(XLSX, sheet_name=SHEET_H2, engine="calamine").set_index('Family')
 
-# Ensure all expected columns exist; missing ones are filled with zeros.
-for col in CHROM_ORDER:
-    if col.endswith('a') and col not in hap1.columns:
-        hap1[col] = 0
-    if col.endswith('b') and col not in hap2.columns:
-        hap2[col] = 0
+# Put each haplotype table in chromosome order; missing chromosomes become zero columns.
+hap1 = hap1.reindex(columns=CHROM_ORDER[0::2], fill_value=0)   # ...a
+hap2 = hap2.reindex(columns=CHROM_ORDER[1::2], fill_value=0)   # ...b
 
-# Reindex individual haplotype tables and ensure integer counts.
-hap1 = hap1.reindex(columns=[c for c in CHROM_ORDER if c.endswith('a')]).fillna(0).astype(int)
-hap2 = hap2.reindex(columns=[c for c in CHROM_ORDER if c.endswith('b')]).fillna(0).astype(int)
-
-# Combine hap1 and hap2 into one wide table (column order: a,b,a,b,...)
-combined = pd.concat([hap1, hap2], axis=1)
-combined = combined.reindex(columns=CHROM_ORDER).fillna(0).astype(int)
+# Combine hap1 and hap2 into one wide table (column order: a,b,a,b,...);
+# families present in only one haplotype get zeros, cast to integer once.
+combined = pd.concat([hap1, hap2], axis=1).reindex(columns=CHROM_ORDER)
+combined = combined.fillna(0).astype(np.int32)
 
 # Select the five families to be plotted
 if FAMILIES_TO_PLOT:
@@ -74,34 +68,30 @@ inner_gap = 0.00   # Gap between sister chromosomes (a vs b); 0 means touching.
 gap = 0.60         # Gap between chromosome pairs.
 
 # Compute x positions so that a,b are adjacent and pairs separated by a gap.
-x_positions = []
-pair_centers = []
-base = 0.0
-
-for a_col, b_col in CHROM_ORDER_PAIRS:
-    x_a = base
-    x_b = base + bar_w + inner_gap
-    x_positions.extend([x_a, x_b])
-    pair_centers.append((x_a + x_b) / 2.0)
-
-    # Move base for the next chromosome pair
-    base += (bar_w + inner_gap) + bar_w + gap
+stride = (bar_w + inner_gap) + bar_w + gap
+x_a = np.arange(len(CHROM_ORDER_PAIRS)) * stride
+x_b = x_a + bar_w + inner_gap
+x_positions = np.empty(2 * len(x_a))
+x_positions[0::2] = x_a
+x_positions[1::2] = x_b
+pair_centers = (x_a + x_b) / 2.0
 
 # Colors for hap1 (a) and hap2 (b)
 color_a = "#4C78A8"
 color_b = "#F58518"
 
-# ---------------- Per-family bar plots ----------------
-for ax, fam in zip(axes, fam_list):
-    vals = combined.loc[fam, CHROM_ORDER].values.astype(float)
+# Counts of the plotted families as one float matrix (rows follow fam_list)
+M = combined.reindex(index=fam_list, columns=CHROM_ORDER).to_numpy(dtype=np.float64)
 
-    xs = np.array(x_positions)
+# ---------------- Per-family bar plots ----------------
+for i, (ax, fam) in enumerate(zip(axes, fam_list)):
+    vals = M[i]
     ys_a = vals[0::2]  # Values for ...a
     ys_b = vals[1::2]  # Values for ...b
 
     # Draw bars for hap1 and hap2
     ax.bar(
-        xs[0::2], ys_a,
+        x_a, ys_a,
         width=bar_w,
         label="hap1 (…a)",
         color=color_a,
@@ -109,7 +99,7 @@ for ax, fam in zip(axes, fam_list):
         linewidth=0.6
     )
     ax.bar(
-        xs[1::2], ys_b,
+        x_b, ys_b,
         width=bar_w,
         label="hap2 (…b)",
         color=color_b,
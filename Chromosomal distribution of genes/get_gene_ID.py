@@ -2,8 +2,8 @@
 # -*- coding: utf-8 -*-
 
 import re
+import numpy as np
 import pandas as pd
-from collections import OrderedDict, defaultdict
 
 # ================= Configuration =================
 ALL_CSV = "all.csv"                    # Column 2 = GeneID, Column 4 = Family; first row is header
@@ -13,20 +13,21 @@ OUT_MISSING = "seeds_not_in_any_group.txt"  # Seed genes not found in any group
 DEDUPLICATE = True   # If True, remove duplicated rows (same group + family + member)
 # =================================================
 
+# Quoted cluster elements ('...' or "...") and the whitespace/comma fallback separator
+QUOTED_RE = re.compile(r"""(['"])(.*?)\1""")
+SEP_RE = re.compile(r"[\s,]+")
+
 
 def load_seed_family_map(path: str) -> pd.DataFrame:
     """
     Load all.csv and extract the seed gene ID (column 2) and family (column 4).
     Uses positional indexing to avoid dependency on column names.
     """
-    df = pd.read_csv(path)
-
-    # iloc[:,1] = GeneID; iloc[:,3] = Family
-    sub = df.iloc[:, [1, 3]].copy()
-    sub.columns = ["GeneID", "Family"]
+    # Column 1 = GeneID; column 3 = Family (only these two are parsed)
+    sub = pd.read_csv(path, usecols=[1, 3], header=0, names=["GeneID", "Family"], dtype=str)
 
-    sub["GeneID"] = sub["GeneID"].astype(str).str.strip()
-    sub["Family"] = sub["Family"].astype(str).str.strip()
+    sub["GeneID"] = sub["GeneID"].str.strip()
+    sub["Family"] = sub["Family"].str.strip()
 
     sub = sub.dropna(subset=["GeneID", "Family"])
     return sub
@@ -46,35 +47,35 @@ def parse_gene_clusters(path: str):
     groups = []
     elem2group = {}
 
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
-        for i, line in enumerate(f, start=1):
-            # Capture strings enclosed by either ' or "
-            elems = re.findall(r"""(['"])(.*?)\1""", line)
+    # Read the whole file in one go and split it into lines ourselves
+    # (same universal-newline handling as iterating over a text-mode file)
+    with open(path, "rb") as f:
+        text = f.read().decode("utf-8", errors="ignore")
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    if lines[-1] == "":
+        lines.pop()
 
-            # Extract the content part (elem[1])
-            members = [m[1].strip() for m in elems if m[1].strip() != ""]
+    for i, line in enumerate(lines, start=1):
+        # Capture strings enclosed by either ' or " and keep the content part
+        members = [m.group(2).strip() for m in QUOTED_RE.finditer(line)]
+        members = [m for m in members if m]
 
-            # Fallback: whitespace split if no quoted strings found
-            if not members:
-                tokens = re.split(r"[\s,]+", line.strip())
-                tokens = [t for t in tokens if t and not t.endswith(":")]
-                members = tokens
+        # Fallback: whitespace split if no quoted strings found
+        if not members:
+            tokens = SEP_RE.split(line.strip())
+            tokens = [t for t in tokens if t and not t.endswith(":")]
+            members = tokens
 
-            gid = f"group_{i}"
+        gid = f"group_{i}"
 
-            # Remove duplicates while preserving order
-            seen = OrderedDict()
-            for m in members:
-                if m not in seen:
-                    seen[m] = True
-            members = list(seen.keys())
+        # Remove duplicates while preserving order
+        members = list(dict.fromkeys(members))
 
-            groups.append((gid, members))
+        groups.append((gid, members))
 
-            # Map element → group (only first occurrence retained)
-            for m in members:
-                if m not in elem2group:
-                    elem2group[m] = gid
+        # Map element → group (only first occurrence retained)
+        for m in members:
+            elem2group.setdefault(m, gid)
 
     return groups, elem2group
 
@@ -85,10 +86,17 @@ def main():
 
     # Parse clustering file
     groups, elem2group = parse_gene_clusters(GENE_CLUSTER_TXT)
-    group_map = {gid: members for gid, members in groups}
 
-    rows = []
-    missing = []
+    # Long table of (group, member_gene), one row per member, filled into pre-sized buffers
+    lens = np.array([len(members) for _, members in groups], dtype=np.intp)
+    group_arr = np.repeat(np.array([gid for gid, _ in groups], dtype=object), lens)
+    member_arr = np.empty(int(lens.sum()), dtype=object)
+    k = 0
+    for _, members in groups:
+        member_arr[k:k + len(members)] = members
+        k += len(members)
+    members_df = pd.DataFrame({"group": group_arr, "member_gene": member_arr})
+    elem2group_s = pd.Series(elem2group, dtype=object, name="group")
 
     """
     For each seed gene:
@@ -97,26 +105,18 @@ def main():
     This effectively propagates the seed's family label to all genes appearing
     in the same cluster.
     """
-    for _, r in seeds.iterrows():
-        seed_id = r["GeneID"]
-        fam = r["Family"]
-        gid = elem2group.get(seed_id)
-
-        if gid is None:
-            # Seed ID did not appear in any group
-            missing.append(seed_id)
-            continue
-
-        members = group_map.get(gid, [])
-        for mem in members:
-            rows.append({
-                "group": gid,
-                "seed_gene": seed_id,   # Seed gene that triggered this group
-                "family": fam,          # Seed's family annotation
-                "member_gene": mem      # Member gene in the same group
-            })
-
-    out_df = pd.DataFrame(rows)
+    # object dtype keeps the merge key type stable even when no seed matches
+    seeds["group"] = seeds["GeneID"].map(elem2group_s).astype(object)
+    hit = seeds.dropna(subset=["group"])
+
+    out_df = (
+        hit.merge(members_df, on="group")
+        .rename(columns={"GeneID": "seed_gene", "Family": "family"})
+        [["group", "seed_gene", "family", "member_gene"]]
+    )
+
+    # Seed IDs that did not appear in any group
+    missing = seeds.loc[seeds["group"].isna(), "GeneID"].tolist()
 
     # Remove duplicated lines caused by multiple seeds mapping to the same group
     if DEDUPLICATE and not out_df.empty:
@@ -8,8 +8,8 @@ from matplotlib.lines import Line2D
 cluster_df = pd.read_csv('cluster_index.txt', sep='\t', header=None, names=['name', 'num'])
 
 # 2. 读取 eggnog.xlsx 和 clean.xlsx，并指定列名
-eggnog_df = pd.read_excel('eggnog.xlsx')
-clean_df = pd.read_excel('clean.xlsx')
+eggnog_df = pd.read_excel('eggnog.xlsx', engine='calamine')
+clean_df = pd.read_excel('clean.xlsx', engine='calamine')
 
 expected_columns = ['Column1', 'Column2', 'Column3']
 if eggnog_df.columns.tolist() != expected_columns:
@@ -18,69 +18,47 @@ if clean_df.columns.tolist() != expected_columns:
     clean_df.columns = expected_columns
 
 categories = ['1', '2', '3', '4', '5', '6', '7', '-']
-eggnog_percentages = {}
-clean_percentages = {}
-eggnog_counts_dict = {}
-clean_counts_dict = {}
-protein_nums = {}
 group_names = cluster_df['name'].tolist()
+protein_nums = dict(zip(cluster_df['name'], cluster_df['num'].astype(float)))
 
-for idx, row in cluster_df.iterrows():
-    name = row['name']
-    num = row['num']
-    eggnog_group_data = eggnog_df[eggnog_df['Column2'] == name]
-    clean_group_data = clean_df[clean_df['Column2'] == name]
-    eggnog_data = eggnog_group_data['Column3'].astype(str).fillna('-')
-    clean_data = clean_group_data['Column3'].astype(str).fillna('-')
-    eggnog_counts = {cat: 0 for cat in categories}
-    clean_counts = {cat: 0 for cat in categories}
-    for value in eggnog_data:
-        if value in categories:
-            eggnog_counts[value] += 1
-        else:
-            eggnog_counts['-'] += 1
-    for value in clean_data:
-        if value in categories:
-            clean_counts[value] += 1
-        else:
-            clean_counts['-'] += 1
-    total_entries_eggnog = len(eggnog_data)
-    total_entries_clean = len(clean_data)
-    if total_entries_eggnog > 0:
-        eggnog_percentages[name] = {cat: eggnog_counts[cat] * 100 / total_entries_eggnog for cat in categories}
-    else:
-        eggnog_percentages[name] = {cat: 0 for cat in categories}
-    if total_entries_clean > 0:
-        clean_percentages[name] = {cat: clean_counts[cat] * 100 / total_entries_clean for cat in categories}
-    else:
-        clean_percentages[name] = {cat: 0 for cat in categories}
-    eggnog_counts_dict[name] = eggnog_counts
-    clean_counts_dict[name] = clean_counts
-    protein_nums[name] = float(num)
-
-eggnog_percent_df = pd.DataFrame.from_dict(eggnog_percentages, orient='index')
-clean_percent_df = pd.DataFrame.from_dict(clean_percentages, orient='index')
-eggnog_percent_df = eggnog_percent_df.loc[group_names]
-clean_percent_df = clean_percent_df.loc[group_names]
+# 不在 categories 中的值（含空值）统一归为 '-'
+cats = pd.Index(categories)
+for df in (eggnog_df, clean_df):
+    col = df['Column3'].astype(str)
+    df['Column3'] = col.where(col.isin(cats), '-')
+
+
+def count_categories(df):
+    # 每个 cluster 各类别计数（行=group_names，列=categories）
+    counts = pd.crosstab(df['Column2'], df['Column3'])
+    return counts.reindex(index=group_names, columns=categories, fill_value=0)
+
+
+def to_percent(counts):
+    totals = counts.sum(axis=1).replace(0, np.nan)
+    return counts.mul(100).div(totals, axis=0).fillna(0)
+
+
+eggnog_counts = count_categories(eggnog_df)
+clean_counts = count_categories(clean_df)
+eggnog_percent_df = to_percent(eggnog_counts)
+clean_percent_df = to_percent(clean_counts)
 protein_nums_list = [protein_nums[name] for name in group_names]
 
 N = len(group_names)
 group_spacing = 1.2
 ind = np.arange(N) * group_spacing
 width = 0.7
-eggnog_stacks = {}
-clean_stacks = {}
-for cat in categories:
-    eggnog_stacks[cat] = eggnog_percent_df[cat].tolist()
-    clean_stacks[cat] = clean_percent_df[cat].tolist()
+# 百分比矩阵（行=cluster，列=categories）
+E = eggnog_percent_df[categories].to_numpy(dtype=float)
+C = clean_percent_df[categories].to_numpy(dtype=float)
 
 # 灰色部分的"数量"
-eggnog_gray_counts = [eggnog_counts_dict[name]['-'] for name in group_names]
-clean_gray_counts = [clean_counts_dict[name]['-'] for name in group_names]
+eggnog_gray_counts = eggnog_counts['-'].tolist()
+clean_gray_counts = clean_counts['-'].tolist()
 
 # 自动计算百分比最大绝对值用于Y轴自适应
-all_stacks = np.array([eggnog_stacks[cat] + [-x for x in clean_stacks[cat]] for cat in categories])
-y_limit = np.ceil(np.max(np.abs(all_stacks.sum(axis=0))) * 1.1)
+y_limit = np.ceil(np.max(np.abs(np.vstack([E, -C]).sum(axis=1))) * 1.1)
 if y_limit < 10: y_limit = 10   # 防止数据极小溢出
 
 # 颜色字典
@@ -99,17 +77,15 @@ fig, ax1 = plt.subplots(figsize=(18, 9))
 
 # eggNOG柱形图
 bottom_eggnog = np.zeros(N)
-for cat in categories:
-    values = eggnog_stacks[cat]
-    ax1.bar(ind, values, width, bottom=bottom_eggnog,
+for j, cat in enumerate(categories):
+    ax1.bar(ind, E[:, j], width, bottom=bottom_eggnog,
             color=colors_dict[cat], edgecolor='black', linewidth=1.0)
-    bottom_eggnog += values
+    bottom_eggnog += E[:, j]
 
 # CLEAN镜像柱形图，注意bottom_clean要逐步更负
 bottom_clean = np.zeros(N)
-for cat in categories:
-    values = clean_stacks[cat]
-    neg_values = -np.array(values)   # array便于计算
+for j, cat in enumerate(categories):
+    neg_values = -C[:, j]
     ax1.bar(ind, neg_values, width, bottom=bottom_clean,
             color=colors_dict[cat], edgecolor='none', linewidth=0)
     bottom_clean += neg_values   # 注意，这里逐步“更负”
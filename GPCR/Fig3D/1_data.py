@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 # Define file paths
@@ -43,22 +44,26 @@ print(f"\nNumber of rows after cleaning: {data_clean.shape[0]} (original: {data.
 # Group and compute statistics
 grouped = data_clean.groupby('cluster')['length']
 
-# Compute statistical metrics
+# Compute statistical metrics (variance is derived from std below)
 stats = grouped.agg(
     count='count',
     mean_length='mean',
     median_length='median',
     min_length='min',
     max_length='max',
-    std_length='std',
-    var_length='var'
+    std_length='std'
 ).reset_index()
 
+mean = stats['mean_length'].to_numpy()
+std = stats['std_length'].to_numpy()
+stats.insert(stats.columns.get_loc('std_length') + 1, 'var_length', std * std)
+
 # Compute range
-stats['range_length'] = stats['max_length'] - stats['min_length']
+stats['range_length'] = stats['max_length'].to_numpy() - stats['min_length'].to_numpy()
 
 # Coefficient of variation (optional)
-stats['cv_length'] = stats['std_length'] / stats['mean_length']
+with np.errstate(divide='ignore', invalid='ignore'):
+    stats['cv_length'] = np.where(mean != 0, std / mean, np.nan)
 
 # Preview statistics
 print("\nStatistics preview:")
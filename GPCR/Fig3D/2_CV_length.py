@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -61,19 +62,13 @@ if stats_clean.empty:
     raise ValueError("No data available for plotting after cleaning. Please check your data.")
 
 # Create a new 'Category' column based on 'EC(eggNOG)' and 'CLEAN'
-def categorize_row(row):
-    ec_known = row['EC(eggNOG)'] == 'known'
-    clean_known = row['CLEAN'] == 'known'
-    if ec_known and not clean_known:
-        return 'EC known only'
-    elif not ec_known and clean_known:
-        return 'CLEAN known only'
-    elif ec_known and clean_known:
-        return 'Both known'
-    else:
-        return 'Others'
-
-stats_clean['Category'] = stats_clean.apply(categorize_row, axis=1)
+ec_known = stats_clean['EC(eggNOG)'].to_numpy() == 'known'
+clean_known = stats_clean['CLEAN'].to_numpy() == 'known'
+stats_clean['Category'] = np.select(
+    [ec_known & ~clean_known, ~ec_known & clean_known, ec_known & clean_known],
+    ['EC known only', 'CLEAN known only', 'Both known'],
+    default='Others'
+)
 
 # Define color palette
 palette = {
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 
@@ -5,7 +6,12 @@ file_path = 'protein_comparison_matrix_CYP450.txt'
 matrix = pd.read_csv(file_path, sep='\t', index_col=0)
 
 
-symmetric_matrix_avg = (matrix + matrix.T) / 2
+# Average with the transpose on the raw array (columns aligned to row order first)
+A = matrix.reindex(columns=matrix.index).to_numpy(dtype=float)
+out = np.empty_like(A)
+np.add(A, A.T, out=out)
+out *= 0.5
+symmetric_matrix_avg = pd.DataFrame(out, index=matrix.index, columns=matrix.index)
 
 
 output_path = 'symmetric_matrix_avg.csv'
@@ -1,7 +1,9 @@
+import numpy as np
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 from scipy.cluster.hierarchy import linkage, leaves_list
+from scipy.spatial.distance import squareform
 from matplotlib.colors import LinearSegmentedColormap
 
 # 1. Read the processed symmetric matrix file
@@ -11,8 +13,11 @@ matrix = pd.read_csv(matrix_file, sep='\t', index_col=0)
 print("Symmetric Matrix loaded successfully:")
 print(matrix.head())
 
-# 2. Perform hierarchical clustering
-Z = linkage(matrix, method='average', optimal_ordering=True)
+# 2. Perform hierarchical clustering on the condensed distance (1 - similarity)
+D = 1.0 - matrix.to_numpy(dtype=float)
+np.fill_diagonal(D, 0.0)
+D = (D + D.T) * 0.5
+Z = linkage(squareform(D, checks=False), method='average', optimal_ordering=True)
 
 # Save row order
 row_order = leaves_list(Z)
@@ -28,7 +33,10 @@ cmap = LinearSegmentedColormap.from_list(
 )
 
 # 4. Plot clustered heatmap
-sns.clustermap(matrix, cmap=cmap, row_linkage=Z, col_linkage=Z, vmin=0, vmax=1)
+# Linkage is reused for both axes; float32 values and a rasterized mesh keep large N×N maps light
+A = matrix.to_numpy(dtype=np.float32)
+sns.clustermap(pd.DataFrame(A, index=matrix.index, columns=matrix.columns),
+               cmap=cmap, row_linkage=Z, col_linkage=Z, vmin=0, vmax=1, rasterized=True)
 
 # 5. Show figure
 plt.title('Clustered Heatmap of Symmetric Protein Comparisons')
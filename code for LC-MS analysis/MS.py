@@ -1,24 +1,41 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.signal import savgol_filter
+from scipy.signal import savgol_coeffs
 
 # ========== 手动设置显示的保留时间区间 ==========
 start_time = 14.8   # 设置起始时间
 end_time = 19.2     # 设置结束时间
 # =============================================
 
+# ========== Savitzky-Golay 平滑（窗口 11，3 阶），系数只算一次 ==========
+SG_WINDOW = 11
+SG_ORDER = 3
+SG_HALF = SG_WINDOW // 2
+# 第 k 行：对窗口拟合多项式后在第 k 个点取值的权重；中间行用于内部点，其余行处理两端
+sg_weights = np.array([savgol_coeffs(SG_WINDOW, SG_ORDER, pos=k, use='dot') for k in range(SG_WINDOW)])
+
+def savgol_smooth(y):
+    """与 savgol_filter(y, 11, 3) 默认的 interp 模式一致"""
+    y = np.asarray(y, dtype=float)
+    out = np.empty_like(y)
+    out[SG_HALF:-SG_HALF] = np.convolve(y, sg_weights[SG_HALF][::-1], mode='valid')
+    out[:SG_HALF] = sg_weights[:SG_HALF] @ y[:SG_WINDOW]
+    out[-SG_HALF:] = sg_weights[SG_HALF + 1:] @ y[-SG_WINDOW:]
+    return out
+# =============================================
+
 # Excel 文件路径
 file_path = '11.1-9-di-13-ac多个酶.xlsx'
-xls = pd.ExcelFile(file_path)
-sheet_names = xls.sheet_names
+# 一次读取全部 sheet，每个 sheet 只解析一次，且只保留 Time / Intensity 两列
+sheets = pd.read_excel(file_path, sheet_name=None, engine='calamine',
+                       usecols=lambda c: c in ('Time', 'Intensity'))
 
 # 收集有效 sheet
-valid_sheets = []
-for sheet in sheet_names:
-    df = pd.read_excel(xls, sheet_name=sheet)
-    if 'Time' in df.columns and 'Intensity' in df.columns and len(df) >= 11:
-        valid_sheets.append(sheet)
+valid_sheets = {
+    sheet: df for sheet, df in sheets.items()
+    if 'Time' in df.columns and 'Intensity' in df.columns and len(df) >= SG_WINDOW
+}
 
 # 创建单一图
 fig, ax = plt.subplots(figsize=(12, 8))
@@ -27,8 +44,7 @@ offset_increment = 300
 colors = plt.cm.tab10(np.linspace(0, 1, len(valid_sheets)))
 intensity_threshold = 1.0e5
 
-for idx, sheet in enumerate(valid_sheets):
-    df = pd.read_excel(xls, sheet_name=sheet)
+for idx, (sheet, df) in enumerate(valid_sheets.items()):
     # ========== 仅保留手动设定的时间区间的数据 ==========
     df = df[(df['Time'] >= start_time) & (df['Time'] <= end_time)]
     if df.empty:  # 没有数据则跳过
@@ -37,15 +53,13 @@ for idx, sheet in enumerate(valid_sheets):
     x = df['Time']
     y = df['Intensity']
 
-    y_smooth = savgol_filter(y, window_length=11, polyorder=3)
-    y_smooth[y_smooth < 0] = 0
-
-    y_filtered = y_smooth.copy()
-    y_filtered[y_filtered < intensity_threshold] = 0
+    y_smooth = savgol_smooth(y)
+    # 负值与低于阈值的点一并原地置零
+    y_smooth[y_smooth < max(intensity_threshold, 0)] = 0
 
-    max_intensity = np.max(y_filtered) if np.max(y_filtered) > 0 else 1
-    y_norm = y_filtered / max_intensity * 200
-    y_offset = y_norm + (idx * offset_increment)
+    max_intensity = y_smooth.max()
+    scale = 200 / max_intensity if max_intensity > 0 else 0
+    y_offset = y_smooth * scale + (idx * offset_increment)
 
     ax.plot(x, y_offset, label=sheet, color=colors[idx], linewidth=2)
     ax.text(x.max() + 0.5, idx * offset_increment + 50, sheet, 
@@ -1,100 +1,136 @@
+import math
 import numpy as np
-from scipy.stats import entropy
+from numba import njit, prange
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
+from scipy.cluster.hierarchy import linkage
+from scipy.spatial.distance import squareform
 
-# Function to read data from Excel sheet
-def read_spectrum_from_excel(file_path, sheet_name):
-    df = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
-    mz_values = df[0].values
-    intensities = df[1].values
-    data = [(mz, intensity) for mz, intensity in zip(mz_values, intensities)]
-    return data
+# Function to extract the m/z and intensity columns of a sheet's DataFrame as arrays
+def spectrum_from_frame(df):
+    mz_values = df[0].to_numpy(dtype=float)
+    intensities = df[1].to_numpy(dtype=float)
+    return mz_values, intensities
 
 # Preprocessing function
-def preprocess_spectrum(data, mz_tolerance=0.01):
-    data = [(mz, intensity) for mz, intensity in data if intensity > 0]
-    if not data:
+def preprocess_spectrum(mz_values, intensities, mz_tolerance=0.01):
+    mask = intensities > 0
+    if not mask.any():
         return np.array([]), np.array([])
 
-    mz_values = np.array([mz for mz, _ in data])
-    intensities = np.array([intensity for _, intensity in data])
+    mz_values = mz_values[mask]
+    intensities = intensities[mask]
 
     if intensities.sum() > 0:
         intensities = intensities / intensities.sum()
 
-    return mz_values, intensities
+    # Sort by m/z so alignment can walk both spectra in order
+    order = np.argsort(mz_values, kind='stable')
+    return mz_values[order], intensities[order]
 
-# Align spectra within m/z tolerance
+# Align spectra within m/z tolerance (mz1 and mz2 sorted); each grid point takes
+# the first peak within tolerance, found with a pointer that only moves forward
+@njit(cache=True)
 def align_spectra(mz1, int1, mz2, int2, mz_tolerance=0.01):
-    aligned_int1 = []
-    aligned_int2 = []
-    all_mz = sorted(set(np.concatenate([mz1, mz2])))
-
-    for mz in all_mz:
-        int1_val = 0
-        int2_val = 0
-        for i, m in enumerate(mz1):
-            if abs(m - mz) <= mz_tolerance:
-                int1_val = int1[i]
-                break
-        for i, m in enumerate(mz2):
-            if abs(m - mz) <= mz_tolerance:
-                int2_val = int2[i]
-                break
-        aligned_int1.append(int1_val)
-        aligned_int2.append(int2_val)
-
-    return np.array(aligned_int1), np.array(aligned_int2)
-
-# Compute spectral entropy
-def spectral_entropy(intensities):
-    if intensities.sum() == 0:
-        return 0
-    intensities = intensities + 1e-10
-    intensities = intensities / intensities.sum()
-    return entropy(intensities, base=2)
+    all_mz = np.unique(np.concatenate((mz1, mz2)))
+    aligned_int1 = np.zeros(len(all_mz))
+    aligned_int2 = np.zeros(len(all_mz))
+    p1 = 0
+    p2 = 0
+    for g in range(len(all_mz)):
+        mz = all_mz[g]
+        while p1 < len(mz1) and mz1[p1] - mz < -mz_tolerance:
+            p1 += 1
+        if p1 < len(mz1) and mz1[p1] - mz <= mz_tolerance:
+            aligned_int1[g] = int1[p1]
+        while p2 < len(mz2) and mz2[p2] - mz < -mz_tolerance:
+            p2 += 1
+        if p2 < len(mz2) and mz2[p2] - mz <= mz_tolerance:
+            aligned_int2[g] = int2[p2]
+    return aligned_int1, aligned_int2
+
+# Entropies (bits) of both spectra and of their mixture in one compiled pass;
+# each vector gets the same +1e-10 padding and renormalization as before
+@njit(cache=True, fastmath=True)
+def _pair_entropies(int1, int2):
+    n = len(int1)
+    if n == 0:
+        return 0.0, 0.0, 0.0
+    eps = 1e-10
+    s1 = 0.0
+    s2 = 0.0
+    for k in range(n):
+        s1 += max(int1[k], 0.0) + eps
+        s2 += max(int2[k], 0.0) + eps
+    t1 = t2 = t12 = 0.0
+    x1 = x2 = x12 = 0.0
+    for k in range(n):
+        a = (max(int1[k], 0.0) + eps) / s1
+        b = (max(int2[k], 0.0) + eps) / s2
+        c = (a + b) / 2
+        a += eps
+        b += eps
+        c += eps
+        t1 += a
+        t2 += b
+        t12 += c
+        x1 += a * math.log(a)
+        x2 += b * math.log(b)
+        x12 += c * math.log(c)
+    ln2 = math.log(2.0)
+    return ((math.log(t1) - x1 / t1) / ln2,
+            (math.log(t2) - x2 / t2) / ln2,
+            (math.log(t12) - x12 / t12) / ln2)
 
 # Compute spectral entropy similarity
+@njit(cache=True)
 def spectral_entropy_similarity(int1, int2):
-    int1 = np.maximum(int1, 0) + 1e-10
-    int2 = np.maximum(int2, 0) + 1e-10
-    int1 = int1 / int1.sum()
-    int2 = int2 / int2.sum()
-
-    entropy1 = spectral_entropy(int1)
-    entropy2 = spectral_entropy(int2)
-
-    combined = (int1 + int2) / 2
-    entropy_combined = spectral_entropy(combined)
-
-    similarity = 1 - (entropy_combined - (entropy1 + entropy2) / 2) / np.log2(len(int1))
-    return max(0, min(1, similarity))
+    if len(int1) <= 1:  # log2(len) is 0 or undefined; identical by convention
+        return 1.0
+    entropy1, entropy2, entropy_combined = _pair_entropies(int1, int2)
+    similarity = 1 - (entropy_combined - (entropy1 + entropy2) / 2) / math.log2(len(int1))
+    return max(0.0, min(1.0, similarity))
+
+# Upper-triangle similarities of every pair of spectra; spectrum k is mz_all/int_all[offsets[k]:offsets[k+1]].
+# Rows are spread over threads and each pair is aligned and scored independently
+@njit(parallel=True, cache=True)
+def pairwise_similarity(mz_all, int_all, offsets, mz_tolerance=0.01):
+    n = len(offsets) - 1
+    similarity_matrix = np.zeros((n, n))
+    for i in prange(n):
+        mz1 = mz_all[offsets[i]:offsets[i + 1]]
+        int1 = int_all[offsets[i]:offsets[i + 1]]
+        for j in range(i, n):  # Symmetric matrix, compute upper triangle
+            mz2 = mz_all[offsets[j]:offsets[j + 1]]
+            int2 = int_all[offsets[j]:offsets[j + 1]]
+            aligned_int1, aligned_int2 = align_spectra(mz1, int1, mz2, int2, mz_tolerance)
+            similarity_matrix[i, j] = spectral_entropy_similarity(aligned_int1, aligned_int2)
+    return similarity_matrix
 
 # Main processing
 def main():
     # File path to the Excel file
     file_path = '243-16672.xlsx'
 
-    # Read all sheets
-    xls = pd.read_excel(file_path, sheet_name=None)
+    # Read all sheets once (no header row: column 0 = m/z, column 1 = intensity)
+    xls = pd.read_excel(file_path, sheet_name=None, header=None, engine='calamine',
+                        usecols=[0, 1], dtype={0: 'float64', 1: 'float64'})
     sheet_names = list(xls.keys())
-    spectra_data = {name: read_spectrum_from_excel(file_path, name) for name in sheet_names}
+    spectra_data = {name: spectrum_from_frame(df) for name, df in xls.items()}
 
-    # Initialize similarity matrix
-    n = len(sheet_names)
-    similarity_matrix = np.zeros((n, n))
+    # Preprocess each spectrum once
+    processed = [preprocess_spectrum(*spectra_data[name]) for name in sheet_names]
+
+    # Pack the spectra back to back for the compiled loop
+    lengths = [len(mz) for mz, _ in processed]
+    offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+    mz_all = np.concatenate([mz for mz, _ in processed] + [np.empty(0)]).astype(np.float64)
+    int_all = np.concatenate([ints for _, ints in processed] + [np.empty(0)]).astype(np.float64)
 
     # Compute pairwise similarities
-    for i in range(n):
-        for j in range(i, n):  # Symmetric matrix, compute upper triangle
-            mz1, int1 = preprocess_spectrum(spectra_data[sheet_names[i]])
-            mz2, int2 = preprocess_spectrum(spectra_data[sheet_names[j]])
-            aligned_int1, aligned_int2 = align_spectra(mz1, int1, mz2, int2)
-            sim = spectral_entropy_similarity(aligned_int1, aligned_int2)
-            similarity_matrix[i, j] = sim
-            similarity_matrix[j, i] = sim  # Mirror to lower triangle
+    similarity_matrix = pairwise_similarity(mz_all, int_all, offsets)
+    similarity_matrix += np.triu(similarity_matrix, 1).T  # Mirror to lower triangle
 
     # Create DataFrame for similarity matrix
     sim_df = pd.DataFrame(similarity_matrix, index=sheet_names, columns=sheet_names)
@@ -103,13 +139,18 @@ def main():
     print("Spectral Entropy Similarity Matrix:")
     print(sim_df.round(3))
 
+    # Average-linkage clustering on the distance 1 - similarity, shared by rows and columns
+    D = 1.0 - similarity_matrix
+    np.fill_diagonal(D, 0.0)
+    Z = linkage(squareform(D, checks=False), method='average')
+
     # --- Clustered heatmap with soft, high-impact journal style ---
     sns.set_theme(style="white")
 
     g = sns.clustermap(
         sim_df,
-        method='average',
-        metric='euclidean',
+        row_linkage=Z,
+        col_linkage=Z,
         cmap='crest',        
         annot=True,
         fmt='.2f',
@@ -29,35 +29,30 @@ OUT_PNG = "picture_plot.png"
 OUT_PDF = "picture_plot.pdf"
 
 # ===== Read and clean data =====
-df = pd.read_excel(INPUT_XLSX)
-
-# Function to clean numeric cells
-def to_float(x):
-    if pd.isna(x):
-        return np.nan
-    x = str(x).replace("%", "").replace(",", "").strip()
-    x = x.replace(" ", "")
-    try:
-        return float(x)
-    except ValueError:
-        return np.nan
-
-# Apply cleaning to all numeric columns
-for c in df.columns[1:]:
-    df[c] = df[c].apply(to_float)
+df = pd.read_excel(INPUT_XLSX, engine="calamine")
+
+# Clean all numeric columns in one pass: drop '%', ',' and whitespace, then parse
+num_cols = df.columns[1:]
+df[num_cols] = (df[num_cols].astype(str)
+                .replace(r"[%,\s]", "", regex=True)
+                .apply(pd.to_numeric, errors="coerce")
+                .astype(float))
 
 # Sort by column 2 (descending)
 df = df.sort_values(by=df.columns[1], ascending=False)
 
+# Pull the sorted columns out once as plain arrays
+values = df.to_numpy()
+
 # X-axis: species (column 1)
-species = df.iloc[:, 0].astype(str)
+species = values[:, 0].astype(str)
 
 # Line: column 2
-line_data = df.iloc[:, 1]
+line_data = values[:, 1].astype(float)
 
 # Bars: columns 3–6
 bar_cols = df.columns[2:6]
-bar_data = df.iloc[:, 2:6]
+bar_data = values[:, 2:6].astype(float)
 
 # ===== Plot =====
 x = np.arange(len(species))
@@ -67,7 +62,7 @@ fig, ax1 = plt.subplots(figsize=(10, 6))
 
 # Bar plots
 for i, col in enumerate(bar_cols):
-    ax1.bar(x + (i - 1.5) * bar_width, bar_data[col], width=bar_width, label=col)
+    ax1.bar(x + (i - 1.5) * bar_width, bar_data[:, i], width=bar_width, label=col)
 
 # Line plot
 ax1.plot(x, line_data, color="black", marker="o", linewidth=2, label=df.columns[1])
@@ -30,28 +30,24 @@ OUT_PNG = "picture_plot.png"
 OUT_PDF = "picture_plot.pdf"
 
 # ===== Read and clean data =====
-df = pd.read_excel(INPUT_XLSX)
+df = pd.read_excel(INPUT_XLSX, engine="calamine")
 
-def to_float(x):
-    if pd.isna(x):
-        return np.nan
-    x = str(x).replace("%", "").replace(",", "").strip().replace(" ", "")
-    try:
-        return float(x)
-    except ValueError:
-        return np.nan
-
-for c in df.columns[1:]:
-    df[c] = df[c].apply(to_float)
+# Clean all numeric columns in one pass: drop '%', ',' and whitespace, then parse
+num_cols = df.columns[1:]
+df[num_cols] = (df[num_cols].astype(str)
+                .replace(r"[%,\s]", "", regex=True)
+                .apply(pd.to_numeric, errors="coerce")
+                .astype(float))
 
 # Sort by column 2 (descending)
 df = df.sort_values(by=df.columns[1], ascending=False)
 
-# Extract data
-species = df.iloc[:, 0].astype(str)
-line_data = df.iloc[:, 1]
+# Extract data (sorted columns as plain arrays)
+values = df.to_numpy()
+species = values[:, 0].astype(str)
+line_data = values[:, 1].astype(float)
 bar_cols = df.columns[2:6]
-bar_data = df.iloc[:, 2:6]
+bar_data = values[:, 2:6].astype(float)
 
 # ===== Plot =====
 x = np.arange(len(species))
@@ -59,11 +55,11 @@ bar_width = 0.5  # smaller width = more space between bars
 
 fig, ax1 = plt.subplots(figsize=(10, 6))
 
-# Stacked bars
-bottom_vals = np.zeros(len(species))
-for col in bar_cols:
-    ax1.bar(x, bar_data[col], width=bar_width, bottom=bottom_vals, label=col)
-    bottom_vals += bar_data[col].fillna(0)
+# Stacked bars: each segment starts at the running sum of the ones below (missing = 0)
+bottoms = np.zeros_like(bar_data)
+bottoms[:, 1:] = np.cumsum(np.nan_to_num(bar_data[:, :-1]), axis=1)
+for i, col in enumerate(bar_cols):
+    ax1.bar(x, bar_data[:, i], width=bar_width, bottom=bottoms[:, i], label=col)
 
 # Line plot
 ax1.plot(x, line_data, color="black", marker="o", linewidth=2, label=df.columns[1])
@@ -18,6 +18,7 @@ mpl.rcParams["ps.fonttype"]  = 42
 # ------------------------
 INPUT_XLSX = "new2.xlsx"
 SHEET_NAME = 0
+USECOLS    = [0, 1, 2, 13, 14, 15, 16, 17]
 OUT_PNG    = "gene_clusters_bar_lines_pies.png"
 OUT_PDF    = "gene_clusters_bar_lines_pies.pdf"
 FIGSIZE    = (16, 8)
@@ -37,16 +38,13 @@ PIE_GAP_FACTOR = 2.10
 # ------------------------
 def normalize_percent_column(series):
 
-    s = series.copy()
-    if s.dtype == object:
-        s = s.astype(str).str.strip()
-        s = s.replace({"nan": np.nan})
-        s = s.str.rstrip("%")
-        s = pd.to_numeric(s, errors="coerce")
+    if series.dtype == object:
+        # strip, drop trailing '%' and parse in one chain; "nan" text parses to NaN
+        s = pd.to_numeric(series.astype(str).str.strip().str.rstrip("%"), errors="coerce")
     else:
-        s = pd.to_numeric(s, errors="coerce")
+        s = pd.to_numeric(series, errors="coerce")
 
-    if np.nanmax(s.values) <= 1.5:  
+    if s.max(skipna=True) <= 1.5:
         s = s * 100.0
     return s
 
@@ -64,29 +62,30 @@ def data_dx_to_inches(ax, fig, dx, frac=0.4, min_px=12, max_px=40):
 # ------------------------
 # Load
 # ------------------------
-df = pd.read_excel(INPUT_XLSX, sheet_name=SHEET_NAME)
+# Only columns 1–3 and 14–18 are used; the rest are never parsed
+try:
+    df = pd.read_excel(INPUT_XLSX, sheet_name=SHEET_NAME, engine="calamine", usecols=USECOLS)
+except pd.errors.ParserError as e:
+    raise ValueError("should contain at least 18 columns") from e
 df.columns = [str(c).strip() for c in df.columns]
 
-if df.shape[1] < 18:
-    raise ValueError("should contain at least 18 columns")
-
 
 col_gene_label = df.iloc[:, 0].astype(str)        # 1st column as string labels
 col_hap1_pct   = normalize_percent_column(df.iloc[:, 1])  # 2nd column
 col_hap2_pct   = normalize_percent_column(df.iloc[:, 2])  # 3rd column
-col_frequency  = coerce_numeric(df.iloc[:, 13])           # 14th column
-pies_vals      = df.iloc[:, 14:18].apply(pd.to_numeric, errors="coerce").fillna(0.0)  # 15–18
+col_frequency  = coerce_numeric(df.iloc[:, 3])            # 14th column
+pies_vals      = df.iloc[:, 4:8].apply(pd.to_numeric, errors="coerce").fillna(0.0)  # 15–18
 
 
-mask_valid = col_frequency.notna()
-col_gene_label = col_gene_label[mask_valid]
-col_hap1_pct   = col_hap1_pct[mask_valid]
-col_hap2_pct   = col_hap2_pct[mask_valid]
-col_frequency  = col_frequency[mask_valid]
-pies_vals      = pies_vals.loc[mask_valid]
+# Keep rows with a frequency, as plain arrays from here on
+mask_valid = col_frequency.notna().to_numpy()
+x_labels   = col_gene_label.to_numpy()[mask_valid]
+hap1_vals  = col_hap1_pct.to_numpy(dtype=float)[mask_valid]
+hap2_vals  = col_hap2_pct.to_numpy(dtype=float)[mask_valid]
+freq_vals  = col_frequency.to_numpy(dtype=float)[mask_valid]
+pie_matrix = pies_vals.to_numpy(dtype=float)[mask_valid]
 
 
-x_labels = col_gene_label.astype(str).values
 x_pos    = np.arange(len(x_labels), dtype=float)
 
 bar_spacing = 1.0
@@ -96,22 +95,22 @@ bar_width   = bar_spacing * 0.8
 fig, ax = plt.subplots(figsize=FIGSIZE)
 
 
-bars = ax.bar(x_pos, col_frequency.values, width=bar_width, alpha=BAR_ALPHA,
+bars = ax.bar(x_pos, freq_vals, width=bar_width, alpha=BAR_ALPHA,
               edgecolor=BAR_EDGE, label="Frequency")
 
 ax.set_xlabel("Gene Number")
 ax.set_ylabel("Frequency (count)")
 
 
-positive_freq = col_frequency[col_frequency > 0]
+positive_freq = freq_vals[freq_vals > 0]
 ymin = (positive_freq.min() * 0.8) if len(positive_freq) else 1
 ax.set_yscale('log')
 ax.set_ylim(bottom=max(ymin, 1e-2))
 
 
 ax2 = ax.twinx()
-line1, = ax2.plot(x_pos, col_hap1_pct.values, marker="o", linewidth=1.8, label="Hap1 (%)")
-line2, = ax2.plot(x_pos, col_hap2_pct.values, marker="s", linewidth=1.8, label="Hap2 (%)")
+line1, = ax2.plot(x_pos, hap1_vals, marker="o", linewidth=1.8, label="Hap1 (%)")
+line2, = ax2.plot(x_pos, hap2_vals, marker="s", linewidth=1.8, label="Hap2 (%)")
 
 
 ax2.set_ylim(30, 70)
@@ -135,20 +134,20 @@ pie_diam_in = data_dx_to_inches(ax, fig, dx=bar_spacing,
                                 frac=PIE_FRAC, min_px=PIE_MIN_PX, max_px=PIE_MAX_PX)
 pie_labels = ["Hap1-1", "Hap2-2", "Hap1-2", "others"]
 
-for i, (x, freq) in enumerate(zip(x_pos, col_frequency.values)):
-    vals = pies_vals.iloc[i].values.astype(float)
-    total = vals.sum()
-    if total <= 0 or not np.isfinite(freq) or freq <= 0:
-        continue
-    fracs = vals / total
-    y_anchor = freq * PIE_GAP_FACTOR  
+# Pie fractions, anchors and the drawable rows for all genes at once
+totals     = pie_matrix.sum(axis=1)
+pie_ok     = (totals > 0) & np.isfinite(freq_vals) & (freq_vals > 0)
+fracs_all  = pie_matrix[pie_ok] / totals[pie_ok, None]
+y_anchors  = freq_vals[pie_ok] * PIE_GAP_FACTOR
+trans_data = ax.transData
 
+for x, y_anchor, fracs in zip(x_pos[pie_ok], y_anchors, fracs_all):
     axins = inset_axes(
         ax,
         width=pie_diam_in, height=pie_diam_in,  
         loc="center",
         bbox_to_anchor=(x, y_anchor),
-        bbox_transform=ax.transData,
+        bbox_transform=trans_data,
         borderpad=0.0
     )
     axins.pie(fracs, startangle=90)
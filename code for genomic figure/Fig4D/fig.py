@@ -9,7 +9,10 @@ warnings.filterwarnings("ignore", category=RuntimeWarning)
 
 # Load data
 file_path = 'output_position_stastics.csv'  # Ensure this is the correct file path
-data = pd.read_csv(file_path)
+loss_cols = ['Initial_RMSD_loss', 'Initial_Steric_loss', 'Initial_Angle_Dev_loss',
+             'Final_RMSD_loss', 'Final_Steric_loss', 'Final_Angle_Dev_loss']
+data = pd.read_csv(file_path, engine='c', usecols=loss_cols,
+                   dtype=dict.fromkeys(loss_cols, 'float64'))
 
 # Calculate the changes in different dimensions
 data['Delta_RMSD_loss'] = data['Final_RMSD_loss'] - data['Initial_RMSD_loss']
@@ -23,17 +26,17 @@ def format_func(value, tick_number):
     else:
         return "{:.0e}".format(value)  # Scientific notation
 
-# Function to get y-ticks based on data
+# Function to get y-ticks (powers of ten) and their exponents based on data
 def get_y_ticks(n):
     n = n[n > 0]  # Exclude zero frequencies
     if len(n) == 0:
-        return []
+        return np.array([]), np.array([], dtype=int)
     min_freq = n.min()
     max_freq = n.max()
     min_exp = int(np.floor(np.log10(min_freq)))
     max_exp = int(np.ceil(np.log10(max_freq)))
-    y_ticks = [10**i for i in range(min_exp, max_exp+1)]
-    return y_ticks
+    y_exps = np.arange(min_exp, max_exp + 1)
+    return np.power(10.0, y_exps), y_exps
 
 # Create the figure and subplots
 fig, axes = plt.subplots(nrows=3, ncols=1, figsize=(10, 24))  # Adjust the figure size
@@ -83,7 +86,7 @@ for i, config in enumerate(plot_configs):
     axes[i].tick_params(axis='y', which='minor', length=0)
 
     # Set Y-ticks based on data
-    y_ticks = get_y_ticks(n)
+    y_ticks, y_exps = get_y_ticks(n)
     axes[i].set_yticks(y_ticks)
     axes[i].yaxis.set_major_formatter(FuncFormatter(format_func))
 
@@ -94,8 +97,8 @@ for i, config in enumerate(plot_configs):
 
     # Set right Y-axis ticks to match left Y-axis ticks
     axes_right.set_yticks(y_ticks)
-    # Set right Y-axis tick labels to log10 of frequency
-    axes_right.set_yticklabels([f"{np.log10(y):.1f}" if y > 0 else "" for y in y_ticks])
+    # Set right Y-axis tick labels to log10 of frequency (the exponents themselves)
+    axes_right.set_yticklabels([f"{e:.1f}" for e in y_exps])
     axes_right.tick_params(axis='y', labelsize=12)
 
     # Remove minor ticks on the right Y-axis
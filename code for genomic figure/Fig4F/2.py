@@ -5,16 +5,7 @@ import matplotlib.pyplot as plt
 combined_file = 'combined_b_factors.txt'
 
 
-b_factors = []
-
-
-with open(combined_file, 'r') as file:
-    for line in file:
-        b_factor = float(line.strip())
-        b_factors.append(b_factor)
-
-
-df = pd.DataFrame(b_factors, columns=['B-factor'])
+df = pd.read_csv(combined_file, header=None, names=['B-factor'], dtype=float)
 
 
 bins = [0, 50, 70, 90, 100]
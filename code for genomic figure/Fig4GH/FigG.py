@@ -6,7 +6,7 @@ from mpl_toolkits.axes_grid1.inset_locator import inset_axes
 
 # 读取本地CSV文件
 file_path = 'AF2_hap_data.csv'  # 替换为你的CSV文件路径
-df = pd.read_csv(file_path)
+df = pd.read_csv(file_path, dtype={'pLDDT': 'float64', 'pTM': 'float64'})
 
 # 查看数据前几行（用于验证数据是否正确读取）
 print(df.head())
@@ -1,3 +1,4 @@
+from collections import Counter
 import matplotlib.pyplot as plt
 
 # 1. 读取hap1_catalytic_activity.txt和hap2_catalytic_activity.txt的内容，并切割和合并成一个列表
@@ -22,29 +23,16 @@ Q2_list = read_and_split_by_dot('Q2_protein_ids.txt')
 Q3_list = read_and_split_by_dot('Q3_protein_ids.txt')
 Q4_list = read_and_split_by_dot('Q4_protein_ids.txt')
 
-# 3. 判断list1中的元素在哪个列表中，并进行标记
-def classify_element(element, q1, q2, q3, q4):
-    if element in q1:
-        return 'Q1'
-    elif element in q2:
-        return 'Q2'
-    elif element in q3:
-        return 'Q3'
-    elif element in q4:
-        return 'Q4'
-    else:
-        return 'None'
+# 3. 判断list1中的元素在哪个列表中，并进行标记（建一次字典，按Q1→Q4优先）
+q_lookup = {}
+for label, q_list in (('Q4', Q4_list), ('Q3', Q3_list), ('Q2', Q2_list), ('Q1', Q1_list)):
+    q_lookup.update(dict.fromkeys(q_list, label))
 
-classification = [classify_element(elem, Q1_list, Q2_list, Q3_list, Q4_list) for elem in list1]
+classification = [q_lookup.get(elem, 'None') for elem in list1]
 
 # 4. 统计list1中元素在四个列表中的分布频率
-distribution = {
-    'Q1': classification.count('Q1'),
-    'Q2': classification.count('Q2'),
-    'Q3': classification.count('Q3'),
-    'Q4': classification.count('Q4'),
-    'None': classification.count('None')
-}
+counts = Counter(classification)
+distribution = {key: counts[key] for key in ('Q1', 'Q2', 'Q3', 'Q4', 'None')}
 
 print("Distribution in each list:")
 for key, value in distribution.items():
@@ -2,7 +2,9 @@ import matplotlib.pyplot as plt
 import pandas as pd
 
 # 假设您的数据在一个名为 'output_position_stastics.csv' 的文件中
-data = pd.read_csv('output_position_stastics.csv')
+loss_cols = ['Initial_RMSD_loss', 'Final_RMSD_loss']
+data = pd.read_csv('output_position_stastics.csv', engine='c', usecols=loss_cols,
+                   dtype=dict.fromkeys(loss_cols, 'float64'))
 
 # 设置图形大小
 plt.figure(figsize=(10, 8))
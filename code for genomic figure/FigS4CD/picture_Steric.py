@@ -2,7 +2,9 @@ import matplotlib.pyplot as plt
 import pandas as pd
 
 # 载入数据
-data = pd.read_csv('output_position_stastics.csv')
+loss_cols = ['Initial_Steric_loss', 'Final_Steric_loss']
+data = pd.read_csv('output_position_stastics.csv', engine='c', usecols=loss_cols,
+                   dtype=dict.fromkeys(loss_cols, 'float64'))
 
 # 绘制散点图比较初始值和最终值，使用对数刻度
 plt.figure(figsize=(10, 8))
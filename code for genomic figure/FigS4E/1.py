@@ -1,36 +1,57 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from numba import njit, prange, get_num_threads
+
+
+# Count values into n_bins half-open bins [lo + k*width, lo + (k+1)*width);
+# each chunk of the input fills its own row of counts, summed at the end
+@njit(parallel=True, cache=True)
+def count_uniform_bins(values, lo, width, n_bins, n_chunks):
+    local = np.zeros((n_chunks, n_bins), dtype=np.int64)
+    chunk = (len(values) + n_chunks - 1) // n_chunks
+    for c in prange(n_chunks):
+        for i in range(c * chunk, min((c + 1) * chunk, len(values))):
+            x = values[i]
+            if x >= lo:
+                k = int((x - lo) / width)
+                if lo + k * width > x:  # division rounded up onto an edge
+                    k -= 1
+                if k < n_bins:
+                    local[c, k] += 1
+    return local.sum(axis=0)
 
 
 file_path = 'TAXUS_PDB.txt'  
-values = []
+CHUNK_ROWS = 200_000  # lines parsed per block; peak memory does not grow with the file
 
 
-with open(file_path, 'r') as file:
-    for line in file:
-        try:
-            value = float(line.strip())
-            values.append(value)
-        except ValueError:
-            pass  
+bins = list(range(50, 101, 10))  # evenly spaced edges 50, 60, ..., 100
 
 
-df = pd.DataFrame(values, columns=['Value'])
-
-
-total_count = len(df)
+# Stream the file through the C tokenizer and add up each block's bin counts;
+# lines that are not a single number are dropped
+total_count = 0
+counts = np.zeros(len(bins) - 1, dtype=np.int64)
+for chunk in pd.read_csv(file_path, header=None, names=['Value'], dtype=str, engine='c',
+                         on_bad_lines='skip', chunksize=CHUNK_ROWS):
+    # float32 is exact enough for pLDDT values (two decimals) against integer bin edges
+    values = pd.to_numeric(chunk['Value'], errors='coerce').dropna().to_numpy(np.float32)
+    total_count += values.size
+    # Count half-open bins [lo, hi) directly (np.histogram would close the last bin at 100)
+    counts += count_uniform_bins(values, bins[0], bins[1] - bins[0],
+                                 len(bins) - 1, get_num_threads())
 
 
 
 reference_number = 61375
-percentage_of_total = (total_count / reference_number) * 100
-
-
+fraction_of_total = total_count / reference_number
+percentage_of_total = fraction_of_total * 100
 
-bins = [50, 60, 70, 80, 90, 100]
 
 
-binned_counts = pd.cut(df['Value'], bins=bins, right=False, include_lowest=True).value_counts(sort=False)
+bin_labels = [f"[{lo}, {hi})" for lo, hi in zip(bins[:-1], bins[1:])]
+binned_counts = pd.Series(counts, index=bin_labels)
 
 
 binned_percentage = (binned_counts / reference_number) * 100
@@ -44,18 +65,21 @@ for bin_range, count, perc in zip(binned_counts.index, binned_counts, binned_per
 fig, axes = plt.subplots(2, 1, figsize=(10, 10), gridspec_kw={'height_ratios': [1, 0.6]})
 
 
-axes[0].pie([percentage_of_total, 100 - percentage_of_total], labels=[f'Values ({percentage_of_total:.2f}%)', 'Other'], autopct='%1.1f%%', startangle=90, colors=['skyblue', 'lightgrey'], counterclock=False)
+# The wedge label already carries the percentage, so no autopct text is drawn
+axes[0].pie([fraction_of_total, 1 - fraction_of_total], labels=[f'Values ({percentage_of_total:.2f}%)', 'Other'], startangle=90, colors=['skyblue', 'lightgrey'], counterclock=False)
 axes[0].set_title('Percentage of Values in TAXUS_PDB.txt relative to 61601', fontsize=16)
 
 
-binned_counts.plot(kind='bar', color='skyblue', edgecolor='black', ax=axes[1])
-for i, (count, perc) in enumerate(zip(binned_counts, binned_percentage)):
-    axes[1].text(i, count + 5, f'{perc:.2f}%', ha='center', va='bottom', fontsize=10)
+bar_x = np.arange(len(counts))
+bars = axes[1].bar(bar_x, counts, width=0.5, color='skyblue', edgecolor='black')
+axes[1].bar_label(bars, labels=[f'{perc:.2f}%' for perc in binned_percentage], padding=3, fontsize=10)
 
 axes[1].set_title('Distribution of Values by Range in TAXUS_PDB.txt', fontsize=16)
 axes[1].set_xlabel('Value Range', fontsize=14)
 axes[1].set_ylabel('Count', fontsize=14)
-axes[1].set_xticklabels(binned_counts.index, rotation=0, fontsize=12)  
+axes[1].set_xticks(bar_x)
+axes[1].set_xticklabels(bin_labels, rotation=0, fontsize=12)
+axes[1].set_xlim(-0.5, len(counts) - 0.5)  
 
 
 axes[1].tick_params(axis='y', labelsize=12)
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 
+import numpy as np
 import pandas as pd
 
 
@@ -9,18 +10,16 @@ OUTPUT_FILE = "merged_pLDDT.xlsx"
 
 def main():
     
-    xls = pd.ExcelFile(INPUT_FILE)
-    sheet_names = xls.sheet_names
-    
+    # Parse every sheet in one pass over the workbook
+    sheets = pd.read_excel(INPUT_FILE, sheet_name=None, engine="calamine")
 
     
-    all_data = []
-    for sheet in sheet_names:
-        df = pd.read_excel(INPUT_FILE, sheet_name=sheet)
-        df["Species"] = sheet  
-        all_data.append(df)
-
-    merged_df = pd.concat(all_data, ignore_index=True)
+    merged_df = pd.concat(sheets.values(), ignore_index=True)
+    # One Species column for all rows, each sheet name repeated over its rows;
+    # categorical so every name is stored once
+    merged_df["Species"] = pd.Categorical.from_codes(
+        np.repeat(np.arange(len(sheets)), [len(df) for df in sheets.values()]),
+        categories=list(sheets))
 
     
     merged_df.to_excel(OUTPUT_FILE, index=False)
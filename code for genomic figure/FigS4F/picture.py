@@ -1,34 +1,43 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
+import matplotlib
+
+# Set to False for batch runs: render off-screen with Agg and only write the PNG
+SHOW_PLOT = True
+if not SHOW_PLOT:
+    matplotlib.use('Agg')
+import matplotlib.pyplot as plt
 
 input_file = 'pLDDT_percentages2.xlsx'
-sheets_dict = pd.read_excel(input_file, sheet_name=None)
+sheets_dict = pd.read_excel(input_file, sheet_name=None, engine='calamine')
 pLDDT_ranges = ['0-50', '50-70', '70-90', '90-100']
 
-group_names = list(sheets_dict.keys())
-x = np.arange(len(group_names))  
+group_names = tuple(sheets_dict)
+n_groups = len(group_names)
+n_ranges = len(pLDDT_ranges)
+x = np.arange(n_groups)  
 
 
-all_ranges = []
-for r in pLDDT_ranges:
-    vals = []
-    for sheet_name in group_names:
-        df = sheets_dict[sheet_name]
-        percent = df.set_index('pLDDT_range').reindex(pLDDT_ranges).loc[r, 'percent']
-        vals.append(percent)
-    all_ranges.append(vals)
+# Stack the sheets and pivot once: row i = pLDDT range i, column j = group j
+long_df = pd.concat(
+    [df[['pLDDT_range', 'percent']].assign(sheet=name) for name, df in sheets_dict.items()],
+    ignore_index=True)
+all_ranges = (long_df.pivot(index='pLDDT_range', columns='sheet', values='percent')
+              .reindex(index=pLDDT_ranges, columns=group_names)
+              .to_numpy())
 
 width = 0.18  
-plt.figure(figsize=(max(10, len(group_names)*0.6), 6))
+plt.figure(figsize=(max(10, n_groups*0.6), 6))
 
 
-for i, r in enumerate(pLDDT_ranges):
-    plt.bar(x + i*width - 1.5*width, all_ranges[i], width, label=r)
+# All groups x ranges in one bar call: row i of the position grid is range i, colour Ci
+bar_x = x[None, :] + np.arange(n_ranges)[:, None]*width - 1.5*width
+bar_colors = np.repeat([f'C{i}' for i in range(n_ranges)], n_groups)
+bars = plt.bar(bar_x.ravel(), all_ranges.ravel(), width, color=bar_colors)
 
 
-high_conf_sum = np.array(all_ranges[2]) + np.array(all_ranges[3])
-plt.plot(x, high_conf_sum, color='red', marker='o', linewidth=2, label='70-100% sum')
+high_conf_sum = all_ranges[2:4].sum(axis=0)  # 70-90 + 90-100
+line, = plt.plot(x, high_conf_sum, color='red', marker='o', linewidth=2, label='70-100% sum')
 
 
 plt.xticks(x, group_names, rotation=60, ha='right')
@@ -36,7 +45,10 @@ plt.xlabel('Group (Sheet name)')
 plt.ylabel('Percent')
 plt.ylim(0, 100)
 plt.title('pLDDT Range Distribution per Group\n(bar: all ranges; line: high-confidence sum)')
-plt.legend(title='pLDDT range', loc='upper left')
+range_handles = [bars.patches[i * n_groups] for i in range(n_ranges)]
+plt.legend([line] + range_handles, ['70-100% sum'] + pLDDT_ranges,
+           title='pLDDT range', loc='upper left')
 plt.tight_layout()
 plt.savefig('pLDDT_per_group_bar+line.png', dpi=300)
-plt.show()
+if SHOW_PLOT:
+    plt.show()